@@ -70,8 +70,8 @@ def quality_aggregator_node(state: QualityGateState) -> Dict:
         workflow_status = "self_healing"
         logger.warning(f"🔧 Quality gates failed - Triggering self-healing (iteration {iteration + 1}/{max_iterations})")
 
-    # Prepare error log
-    error_log = state.get("error_log", [])
+    # New error log entries only; the state reducer appends them
+    error_log = []
     if not all_passed:
         errors = []
         if not security_passed:
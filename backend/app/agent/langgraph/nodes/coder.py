@@ -6,6 +6,7 @@ Supports multiple model types via prompt adaptation.
 
 import logging
 import json
+import os
 from typing import Dict, List
 from datetime import datetime
 
@@ -221,9 +222,6 @@ def coder_node(state: QualityGateState) -> Dict:
 
         # Write files and create artifacts
         # FIXED: Prevent duplicate artifacts by tracking unique normalized paths
-        import os
-        from pathlib import Path
-
         seen_paths = set()  # Track normalized absolute paths to prevent duplicates
 
         for file_info in generated_files:
@@ -233,7 +231,8 @@ def coder_node(state: QualityGateState) -> Dict:
             description = file_info.get("description", "")
 
             # Normalize path to prevent duplicates
-            normalized_path = os.path.normpath(os.path.join(workspace_root, filename))
+            full_path = os.path.join(workspace_root, filename)
+            normalized_path = os.path.normpath(full_path)
 
             # Skip if already processed (duplicate in generated_files)
             if normalized_path in seen_paths:
@@ -243,8 +242,7 @@ def coder_node(state: QualityGateState) -> Dict:
             seen_paths.add(normalized_path)
 
             # Check if file already exists to determine action
-            full_path = os.path.join(workspace_root, filename)
-            file_existed = os.path.exists(full_path)
+            file_existed = os.path.exists(normalized_path)
             action = "modified" if file_existed else "created"
 
             # Write file to workspace
@@ -285,8 +283,6 @@ def coder_node(state: QualityGateState) -> Dict:
             logger.info(f"🗑️  Processing {len(deleted_files)} file(s) for deletion...")
 
             for filename in deleted_files:
-                # Normalize path
-                normalized_path = os.path.normpath(os.path.join(workspace_root, filename))
                 full_path = os.path.join(workspace_root, filename)
 
                 # Check if file exists before trying to delete
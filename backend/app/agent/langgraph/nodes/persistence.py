@@ -7,7 +7,7 @@ import logging
 from typing import Dict
 from datetime import datetime
 from app.agent.langgraph.schemas.state import QualityGateState
-from app.agent.langgraph.tools.context_manager import ContextManager
+from app.agent.langgraph.tools.context_manager import get_context_manager
 
 logger = logging.getLogger(__name__)
 
@@ -30,7 +30,7 @@ def persistence_node(state: QualityGateState) -> Dict:
     logger.info("💾 Persistence Node: Saving state to .ai_context.json...")
 
     workspace_root = state["workspace_root"]
-    context_mgr = ContextManager(workspace_root)
+    context_mgr = get_context_manager(workspace_root)
 
     # Calculate duration
     started_at = datetime.fromisoformat(state["started_at"])
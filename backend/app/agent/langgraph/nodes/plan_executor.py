@@ -8,17 +8,19 @@ This node executes approved plans step by step, providing:
 """
 
 import logging
-from typing import Dict, Any, List, Optional, AsyncGenerator
-from datetime import datetime
-
-from app.agent.langgraph.schemas.state import QualityGateState, DebugLog
+from collections import Counter, deque
+from typing import Dict, Any, List, Optional, AsyncGenerator, Set
+from app.agent.langgraph.schemas.state import QualityGateState, debug_log_from_tuple
 from app.agent.langgraph.schemas.plan import (
     ExecutionPlan,
     PlanStep,
     StepStatus,
     PlanAction,
     PlanApprovalStatus,
+    PlanComplexity,
 )
+from app.core.config import settings
+from app.utils.timestamps import CachedTimestamp
 from app.hitl import get_hitl_manager
 from app.hitl.models import (
     HITLRequest,
@@ -28,6 +30,16 @@ from app.hitl.models import (
 
 logger = logging.getLogger(__name__)
 
+# Relative cost of a step by estimated complexity (admission control)
+_COMPLEXITY_WEIGHTS = {
+    PlanComplexity.LOW.value: 1,
+    PlanComplexity.MEDIUM.value: 3,
+    PlanComplexity.HIGH.value: 8,
+}
+
+# Workflows with a plan currently executing
+_active_plans: Set[str] = set()
+
 
 class PlanExecutor:
     """Executes approved plans step by step
@@ -35,10 +47,30 @@ class PlanExecutor:
     Integrates with the existing LangGraph workflow to execute
     each step of an approved plan, with HITL support for
     steps that require user approval.
+
+    A per-action circuit breaker stops executing an action type once it
+    has failed more than CIRCUIT_BREAKER_THRESHOLD times in a row;
+    remaining steps of that action are skipped.
     """
 
+    CIRCUIT_BREAKER_THRESHOLD = 3
+
+    # Event timestamps are reused within this window (seconds)
+    TIMESTAMP_RESOLUTION = 0.01
+
     def __init__(self):
         self.hitl_manager = get_hitl_manager()
+        self._failure_counts: Counter = Counter()
+        self._circuit_open: Set[str] = set()
+        self._timestamp = CachedTimestamp(self.TIMESTAMP_RESOLUTION)
+
+    def now_iso(self) -> str:
+        """Get the current UTC timestamp, refreshed at most every TIMESTAMP_RESOLUTION
+
+        Returns:
+            ISO formatted timestamp string
+        """
+        return self._timestamp.now_iso()
 
     async def execute_plan(
         self,
@@ -66,16 +98,29 @@ class PlanExecutor:
 
         # Start execution
         plan.start_execution()
+        self._failure_counts.clear()
+        self._circuit_open.clear()
 
         yield {
             "type": "execution_start",
             "plan_id": plan.plan_id,
             "total_steps": plan.total_steps,
-            "timestamp": datetime.utcnow().isoformat(),
+            "timestamp": self.now_iso(),
         }
 
         # Execute each step
         for step in plan.steps:
+            # Skip action types whose circuit is open; keyed like dispatch
+            action = step.action.lower()
+            if action in self._circuit_open:
+                yield {
+                    "type": "step_skipped",
+                    "step": step.step,
+                    "reason": f"Circuit open for action '{step.action}'",
+                }
+                step.status = StepStatus.SKIPPED.value
+                continue
+
             # Check if dependencies are met
             if not self._check_dependencies(plan, step):
                 yield {
@@ -115,6 +160,7 @@ class PlanExecutor:
 
                 if result.get("success", False):
                     plan.complete_step(step.step, result.get("output", ""))
+                    self._failure_counts[action] = 0
                     yield {
                         "type": "step_complete",
                         "step": step.step,
@@ -123,6 +169,7 @@ class PlanExecutor:
                     }
                 else:
                     plan.fail_step(step.step, result.get("error", "Unknown error"))
+                    self._record_failure(action)
                     yield {
                         "type": "step_failed",
                         "step": step.step,
@@ -155,9 +202,24 @@ class PlanExecutor:
             "type": "execution_complete",
             "plan_id": plan.plan_id,
             "progress": plan.get_progress(),
-            "timestamp": datetime.utcnow().isoformat(),
+            "timestamp": self.now_iso(),
         }
 
+    def _record_failure(self, action: str) -> None:
+        """Count a consecutive failure and open the circuit past the threshold
+
+        Args:
+            action: Lower-cased action type of the failed step
+        """
+        self._failure_counts[action] += 1
+        if self._failure_counts[action] > self.CIRCUIT_BREAKER_THRESHOLD:
+            if action not in self._circuit_open:
+                logger.warning(
+                    f"Circuit opened for action '{action}' after "
+                    f"{self._failure_counts[action]} consecutive failures"
+                )
+            self._circuit_open.add(action)
+
     def _check_dependencies(self, plan: ExecutionPlan, step: PlanStep) -> bool:
         """Check if all dependencies for a step are met
 
@@ -194,9 +256,42 @@ class PlanExecutor:
         Returns:
             Approval result with 'approved' boolean
         """
+        # Nobody is listening for approvals - skip building the request
+        if not self.hitl_manager or not self.hitl_manager.is_enabled():
+            return {"approved": True, "reason": "HITL disabled"}
+
+        request = self._build_approval_request(plan, step, state)
+
+        # For now, auto-approve (actual HITL integration would wait for response)
+        # In production, this would use the HITL manager to wait for user response
+        logger.info(
+            f"Step {step.step} requires approval ({request.request_id}) - auto-approving for now"
+        )
+
+        return {
+            "approved": True,
+            "reason": "Auto-approved (HITL integration pending)"
+        }
+
+    def _build_approval_request(
+        self,
+        plan: ExecutionPlan,
+        step: PlanStep,
+        state: QualityGateState
+    ) -> HITLRequest:
+        """Build the HITL approval request for a step
+
+        Args:
+            plan: The execution plan
+            step: The step requiring approval
+            state: Workflow state
+
+        Returns:
+            HITLRequest describing the step
+        """
         workflow_id = state.get("workflow_id", plan.plan_id)
 
-        request = HITLRequest(
+        return HITLRequest(
             workflow_id=workflow_id,
             stage_id=f"plan_step_{step.step}",
             agent_id="plan_executor",
@@ -217,15 +312,6 @@ class PlanExecutor:
             priority="high" if step.estimated_complexity == "high" else "normal"
         )
 
-        # For now, auto-approve (actual HITL integration would wait for response)
-        # In production, this would use the HITL manager to wait for user response
-        logger.info(f"Step {step.step} requires approval - auto-approving for now")
-
-        return {
-            "approved": True,
-            "reason": "Auto-approved (HITL integration pending)"
-        }
-
     async def _execute_step(
         self,
         step: PlanStep,
@@ -383,7 +469,9 @@ async def plan_executor_node(state: QualityGateState) -> Dict:
     """LangGraph node for plan execution
 
     This node integrates with the existing workflow to execute
-    approved plans step by step.
+    approved plans step by step. Plans whose estimated cost exceeds
+    settings.max_plan_budget, or whose workflow is already executing
+    a plan, are rejected before an executor is created.
 
     Args:
         state: Current workflow state
@@ -405,24 +493,69 @@ async def plan_executor_node(state: QualityGateState) -> Dict:
     # Reconstruct plan from state
     plan = ExecutionPlan.from_dict(plan_data)
 
+    # Admission control: reject before allocating executor state
+    estimated_cost = estimate_plan_cost(plan)
+    if estimated_cost > settings.max_plan_budget:
+        logger.warning(
+            f"Rejecting plan {plan.plan_id}: estimated cost {estimated_cost} "
+            f"exceeds budget {settings.max_plan_budget}"
+        )
+        return {
+            "workflow_status": "rejected_over_budget",
+            "last_error": (
+                f"Plan estimated cost {estimated_cost} exceeds budget {settings.max_plan_budget}"
+            ),
+        }
+
+    workflow_id = state.get("workflow_id", plan.plan_id)
+    if workflow_id in _active_plans:
+        logger.warning(f"Rejecting plan {plan.plan_id}: workflow {workflow_id} already executing a plan")
+        return {
+            "workflow_status": "error",
+            "last_error": f"A plan is already executing for workflow {workflow_id}",
+        }
+
+    _active_plans.add(workflow_id)
+    try:
+        return await _run_plan(plan, state)
+    finally:
+        _active_plans.discard(workflow_id)
+
+
+def estimate_plan_cost(plan: ExecutionPlan) -> int:
+    """Estimate the execution cost of a plan from step complexities
+
+    Args:
+        plan: The execution plan
+
+    Returns:
+        Sum of complexity weights over all steps
+    """
+    medium = _COMPLEXITY_WEIGHTS[PlanComplexity.MEDIUM.value]
+    return sum(
+        _COMPLEXITY_WEIGHTS.get(step.estimated_complexity, medium)
+        for step in plan.steps
+    )
+
+
+async def _run_plan(plan: ExecutionPlan, state: QualityGateState) -> Dict:
+    """Execute an admitted plan and build the node's state update"""
     # Create executor
     executor = PlanExecutor()
 
-    # Collect results
-    debug_logs = []
-    artifacts = []
+    # Collect results (raw tuples, bounded; expanded to DebugLog on return)
+    enable_debug = state.get("enable_debug")
+    debug_events = deque(maxlen=settings.debug_log_cap)
     last_result = None
 
     async for update in executor.execute_plan(plan, state):
-        if state.get("enable_debug"):
-            debug_logs.append(DebugLog(
-                timestamp=datetime.utcnow().isoformat(),
-                node="plan_executor",
-                agent="PlanExecutor",
-                event_type=update.get("type", "progress"),
-                content=str(update),
-                metadata=update,
-                token_usage=None
+        if enable_debug:
+            debug_events.append((
+                executor.now_iso(),
+                "plan_executor",
+                "PlanExecutor",
+                update.get("type", "progress"),
+                update,
             ))
         last_result = update
 
@@ -439,7 +572,7 @@ async def plan_executor_node(state: QualityGateState) -> Dict:
         "workflow_status": status,
         "execution_plan": plan.to_dict(),
         "plan_progress": progress,
-        "debug_logs": debug_logs,
+        "debug_logs": [debug_log_from_tuple(entry) for entry in debug_events],
     }
 
 
@@ -8,6 +8,7 @@ Supports multiple models:
 - GPT-OSS/Qwen: Structured analysis without special tags
 """
 
+import asyncio
 import logging
 from typing import Dict
 from datetime import datetime
@@ -17,12 +18,47 @@ from app.core.config import settings
 
 logger = logging.getLogger(__name__)
 
+# Analysis frame shared by both output formats
+_COMMON_FRAME = """1. Pattern Analysis: Reviewing {issue_count} issues across {iteration} iterations
+2. State Validation:
+   - Artifacts present: {has_artifacts}
+   - Diffs generated: {diff_count}
+   - Review feedback: {feedback_status}
+3. Root Cause Identification:
+   {root_cause}
+4. Termination Check:
+   - Iteration {iteration}/{max_iterations}
+   - Loop should terminate: {should_terminate}
+5. Recommended Action: {recommendation}"""
+
+# DeepSeek-R1: Use <think> tags
+_DEEPSEEK_TMPL = """<think>
+{analysis_content}
+</think>
+
+Analysis: The refinement loop is facing {issue_count} persistent issues.
+Root cause: {root_cause}
+Recommendation: {recommendation}"""
+
+# GPT-OSS/Qwen: Structured markdown without <think> tags
+_MARKDOWN_TMPL = """## Root Cause Analysis
+
+{analysis_content}
+
+---
+
+**Summary:** The refinement loop is facing {issue_count} persistent issues.
+**Root Cause:** {root_cause}
+**Recommendation:** {recommendation}"""
+
 
-def rca_analyzer_node(state: QualityGateState) -> Dict:
+async def rca_analyzer_node(state: QualityGateState) -> Dict:
     """RCA Node: Analyze why refinement is failing
 
     Uses DeepSeek-R1's reasoning capabilities to perform deep analysis
-    before entering refinement loop.
+    before entering refinement loop. The root-cause and recommendation
+    heuristics are independent, so they are dispatched concurrently
+    off the event loop.
 
     CRITICAL: This node MUST run before refiner to prevent infinite loops.
 
@@ -65,46 +101,31 @@ def rca_analyzer_node(state: QualityGateState) -> Dict:
 
     logger.info(f"🔍 RCA using model type: {model_type} (think tags: {uses_think_tags})")
 
-    # Build analysis content
-    root_cause = _identify_root_cause(issues, code_diffs, refinement_iteration)
-    recommendation = _recommend_action(issues, refinement_iteration, max_iterations)
-
-    analysis_content = f"""1. Pattern Analysis: Reviewing {len(issues)} issues across {refinement_iteration} iterations
-2. State Validation:
-   - Artifacts present: {coder_output is not None}
-   - Diffs generated: {len(code_diffs)}
-   - Review feedback: {'available' if review_feedback else 'missing'}
-3. Root Cause Identification:
-   {root_cause}
-4. Termination Check:
-   - Iteration {refinement_iteration}/{max_iterations}
-   - Loop should terminate: {refinement_iteration >= max_iterations}
-5. Recommended Action: {recommendation}"""
+    # Build analysis content (independent heuristics run concurrently)
+    root_cause, recommendation = await asyncio.gather(
+        asyncio.to_thread(_identify_root_cause, issues, code_diffs, refinement_iteration),
+        asyncio.to_thread(_recommend_action, issues, refinement_iteration, max_iterations),
+    )
+
+    fields = {
+        "issue_count": len(issues),
+        "iteration": refinement_iteration,
+        "max_iterations": max_iterations,
+        "has_artifacts": coder_output is not None,
+        "diff_count": len(code_diffs),
+        "feedback_status": "available" if review_feedback else "missing",
+        "should_terminate": refinement_iteration >= max_iterations,
+        "root_cause": root_cause,
+        "recommendation": recommendation,
+    }
+    fields["analysis_content"] = _COMMON_FRAME.format_map(fields)
 
     # Format output based on model type
-    if uses_think_tags:
-        # DeepSeek-R1: Use <think> tags
-        rca_analysis = f"""<think>
-{analysis_content}
-</think>
-
-Analysis: The refinement loop is facing {len(issues)} persistent issues.
-Root cause: {root_cause}
-Recommendation: {recommendation}"""
-    else:
-        # GPT-OSS/Qwen: Structured markdown without <think> tags
-        rca_analysis = f"""## Root Cause Analysis
-
-{analysis_content}
-
----
-
-**Summary:** The refinement loop is facing {len(issues)} persistent issues.
-**Root Cause:** {root_cause}
-**Recommendation:** {recommendation}"""
+    template = _DEEPSEEK_TMPL if uses_think_tags else _MARKDOWN_TMPL
+    rca_analysis = template.format_map(fields)
 
     logger.info("🔍 RCA Complete")
-    logger.info(f"   Root Cause: {_identify_root_cause(issues, code_diffs, refinement_iteration)[:100]}...")
+    logger.info(f"   Root Cause: {root_cause[:100]}...")
 
     # Add debug log with model-aware agent name
     debug_logs = []
@@ -9,6 +9,7 @@ import difflib
 from typing import Dict, List
 from datetime import datetime
 from app.agent.langgraph.schemas.state import QualityGateState, CodeDiff, DebugLog
+from app.agent.langgraph.tools.filesystem_tools import write_file_tool
 from app.core.config import settings
 
 # Import LLM provider for model-agnostic calls
@@ -313,9 +314,6 @@ def refiner_node(state: QualityGateState) -> Dict:
     updated_filenames = set()  # Track which files were updated
 
     for code_diff in code_diffs:
-        # Write modified content to file
-        from app.agent.langgraph.tools.filesystem_tools import write_file_tool
-
         # Use centralized path utilities for cross-platform compatibility
         original_file_path = code_diff["file_path"]
 
@@ -343,23 +343,27 @@ def _fallback_code_reviewer(artifacts: List[Dict], user_request: str) -> Dict:
         filename = artifact.get("filename", "unknown")
         language = artifact.get("language", "text")
 
-        # Check 1: File not empty
+        content_length = len(content)
+
+        # Check 1: File not empty (isspace avoids copying content via strip)
         max_quality_points += 1
-        if len(content.strip()) > 0:
+        if content and not content.isspace():
             total_quality_points += 1
         else:
             issues.append(f"{filename}: File is empty")
 
         # Check 2: Reasonable file size
         max_quality_points += 1
-        if 10 < len(content) < 10000:
+        if 10 < content_length < 10000:
             total_quality_points += 1
-        elif len(content) < 10:
+        elif content_length < 10:
             issues.append(f"{filename}: File too short (may be incomplete)")
         else:
             suggestions.append(f"{filename}: File is very large, consider splitting")
 
-        # Language-specific checks
+        # Language-specific checks. Plain substring checks are used on purpose:
+        # each stops at its first match, which is far cheaper than a combined
+        # regex that has to scan the whole file to collect every marker
         if language == "python":
             # Check 3: Has docstring or comments
             max_quality_points += 1
@@ -1,16 +1,70 @@
 """Security Gate Node for OWASP and path validation
 
 Scans for common vulnerabilities and ensures sandboxing compliance.
+Patterns are compiled with google-re2 when installed, which guarantees
+linear-time matching on untrusted (LLM-generated) code. When hyperscan
+is installed, a single multi-pattern pass selects which patterns need
+the detailed per-pattern scan.
 """
 
 import logging
 import re
-from typing import Dict, List
+import threading
+from bisect import bisect_right
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Set, Tuple
 from app.agent.langgraph.schemas.state import QualityGateState, SecurityFinding
 from app.agent.langgraph.tools.file_validator import FileValidator
 
+try:
+    import re2
+    RE2_AVAILABLE = True
+except ImportError:
+    RE2_AVAILABLE = False
+
+try:
+    import hyperscan
+    HYPERSCAN_AVAILABLE = True
+except ImportError:
+    HYPERSCAN_AVAILABLE = False
+
 logger = logging.getLogger(__name__)
 
+# RE2's \s is ASCII-only; this class matches exactly what Python's \s does
+# on str input, so RE2 does not miss secrets separated by Unicode spaces.
+# RE2's \b is ASCII-only as well and has no such rewrite: a keyword right
+# after a non-ASCII letter ("éeval(") is reported by RE2 but not by re
+_RE2_WHITESPACE = r"[\t\n\x0b\f\r\x1c-\x1f\x85\p{Z}]"
+_WHITESPACE_ESCAPE = re.compile(r"(?<!\\)\\s")
+
+_NEWLINE = re.compile("\n")
+
+
+def _compile_pattern(pattern: str, flags: str):
+    """Compile a scanner pattern, preferring RE2 over backtracking re
+
+    Args:
+        pattern: Regular expression source
+        flags: Inline flag letters (e.g. "im"), understood by both engines
+
+    Returns:
+        Compiled pattern (re2 or re) exposing finditer/search
+    """
+    source = f"(?{flags}){pattern}"
+    if RE2_AVAILABLE:
+        try:
+            # Patterns only use \s outside character classes
+            return re2.compile(_WHITESPACE_ESCAPE.sub(lambda _: _RE2_WHITESPACE, source))
+        except re2.error as e:
+            logger.warning(f"RE2 cannot compile security pattern {pattern!r} ({e}), falling back to re")
+    return _compile_re(pattern, flags)
+
+
+def _compile_re(pattern: str, flags: str) -> re.Pattern:
+    """Compile a scanner pattern with re (flags as in _compile_pattern)"""
+    return re.compile(f"(?{flags}){pattern}")
+
 
 class SecurityScanner:
     """OWASP-based security vulnerability scanner"""
@@ -27,6 +81,17 @@ class SecurityScanner:
     # File extensions to SKIP entirely (documentation, styles, etc.)
     SKIP_EXTENSIONS = [".md", ".txt", ".css", ".scss", ".less", ".svg", ".png", ".jpg", ".gif"]
 
+    # Files larger than this (in characters) are not scanned (bundled/minified output)
+    MAX_SCAN_SIZE = 256 * 1024
+
+    # Findings reported per vulnerability category per file; further matches
+    # are collapsed into a single truncation record
+    MAX_FINDINGS_PER_CATEGORY = 25
+
+    # Matches examined per vulnerability category per file, excluded ones
+    # included, before the category is truncated
+    MAX_MATCHES_PER_CATEGORY = 1000
+
     # OWASP Top 10 patterns with file type context
     VULNERABILITY_PATTERNS = {
         "sql_injection": {
@@ -103,20 +168,12 @@ class SecurityScanner:
     @staticmethod
     def get_file_type(filename: str) -> str:
         """Determine the file type category based on extension"""
-        ext = "." + filename.split(".")[-1].lower() if "." in filename else ""
-
-        if ext in SecurityScanner.SCANNABLE_EXTENSIONS["python"]:
-            return "python"
-        elif ext in SecurityScanner.SCANNABLE_EXTENSIONS["javascript"]:
-            return "javascript"
-        elif ext in SecurityScanner.SCANNABLE_EXTENSIONS["web"]:
-            return "web"
-        elif ext in SecurityScanner.SCANNABLE_EXTENSIONS["config"]:
-            return "config"
-        elif ext in SecurityScanner.SKIP_EXTENSIONS:
+        dot = filename.rfind(".")
+        ext = filename[dot:].lower() if dot >= 0 else ""
+
+        if ext in _SKIP_EXTENSIONS:
             return "skip"
-        else:
-            return "backend"  # Default to backend for unknown types
+        return _EXTENSION_TYPES.get(ext, "backend")  # Default to backend for unknown types
 
     @staticmethod
     def should_scan_for_vuln(file_type: str, vuln_file_types: List[str]) -> bool:
@@ -170,56 +227,301 @@ class SecurityScanner:
             logger.debug(f"⏭️  Skipping security scan for {filename} (non-code file)")
             return findings
 
-        for vuln_type, config in SecurityScanner.VULNERABILITY_PATTERNS.items():
-            # Check if this vulnerability type applies to this file type
-            vuln_file_types = config.get("file_types", ["backend"])
-            if not SecurityScanner.should_scan_for_vuln(file_type, vuln_file_types):
-                continue
-
-            exclude_patterns = config.get("exclude_patterns", [])
-
-            for pattern in config["patterns"]:
-                try:
-                    matches = re.finditer(pattern, code, re.IGNORECASE | re.MULTILINE)
-                    for match in matches:
-                        # Check if this match should be excluded
-                        match_start = match.start()
-                        match_end = match.end()
-
-                        # Get surrounding context (50 chars before and after)
-                        context_start = max(0, match_start - 50)
-                        context_end = min(len(code), match_end + 50)
-                        context = code[context_start:context_end]
-
-                        # Check if any exclude pattern matches in context
-                        is_excluded = False
-                        for exclude_pattern in exclude_patterns:
-                            if re.search(exclude_pattern, context, re.IGNORECASE):
-                                is_excluded = True
-                                logger.debug(f"Excluding match '{match.group()}' due to safe pattern: {exclude_pattern}")
-                                break
-
-                        if is_excluded:
-                            continue
-
-                        # Calculate line number
-                        line_number = code[:match.start()].count('\n') + 1
-
-                        finding = SecurityFinding(
-                            severity=config["severity"],
-                            category=vuln_type,
-                            description=config["description"],
-                            file_path=filename,
-                            line_number=line_number,
-                            recommendation=config["recommendation"]
-                        )
-                        findings.append(finding)
-                except re.error as e:
-                    logger.warning(f"Regex error scanning {filename} for {vuln_type}: {e}")
+        if not code:
+            return findings
+
+        # Skip oversized files, but leave a trace in the report
+        if len(code) > SecurityScanner.MAX_SCAN_SIZE:
+            logger.warning(
+                f"⏭️  Skipping security scan for {filename} "
+                f"({len(code)} chars > {SecurityScanner.MAX_SCAN_SIZE})"
+            )
+            findings.append(SecurityFinding(
+                severity="low",
+                category="scan_skipped",
+                description=f"File too large to scan ({len(code)} characters)",
+                file_path=filename,
+                line_number=None,
+                recommendation="Review large or generated files manually"
+            ))
+            return findings
+
+        # RE2 and Hyperscan match UTF-8. Code with lone surrogates cannot be
+        # encoded, so it is scanned with the re-compiled patterns instead
+        try:
+            utf8 = code.encode("utf-8")
+        except UnicodeEncodeError:
+            utf8 = None
+        compiled_vulns = _COMPILED_VULNS if utf8 is not None else _COMPILED_VULNS_RE
+
+        # Single pass over the file to find which patterns can match at all
+        candidates = _candidate_patterns(file_type, code, utf8)
+        if candidates is not None and not candidates:
+            return findings
+
+        # Newline offsets for O(log n) line lookup (built on first finding)
+        newline_offsets: Optional[List[int]] = None
+
+        # Loop-invariant values bound to locals for the per-match hot path
+        max_per_category = SecurityScanner.MAX_FINDINGS_PER_CATEGORY
+        max_matches = SecurityScanner.MAX_MATCHES_PER_CATEGORY
+        code_length = len(code)
+        append_finding = findings.append
+        debug_enabled = logger.isEnabledFor(logging.DEBUG)
+
+        # Only vulnerability types that apply to this file type
+        for vuln_type, severity, description, recommendation, patterns, exclude_patterns in compiled_vulns[file_type]:
+            category_count = 0
+            match_count = 0
+            truncated = False
+
+            # Fields shared by every finding of this category in this file;
+            # each finding is a shallow copy with its own line number
+            template = SecurityFinding(
+                severity=severity,
+                category=vuln_type,
+                description=description,
+                file_path=filename,
+                line_number=None,
+                recommendation=recommendation
+            )
+
+            for pattern_index, pattern in enumerate(patterns):
+                if candidates is not None and (vuln_type, pattern_index) not in candidates:
+                    continue
+
+                for match in pattern.finditer(code):
+                    # Bound the exclude checks on match-heavy files too
+                    if match_count >= max_matches:
+                        truncated = True
+                        break
+                    match_count += 1
+
+                    # Check if this match should be excluded
+                    match_start, match_end = match.span()
+
+                    # Surrounding context window (50 chars before and after),
+                    # searched in place rather than sliced out (exclude
+                    # patterns are always re, whose search honors pos/endpos
+                    # without scanning the rest of code)
+                    context_start = max(0, match_start - 50)
+                    context_end = min(code_length, match_end + 50)
+
+                    # Check if any exclude pattern matches in context
+                    is_excluded = False
+                    for exclude_pattern in exclude_patterns:
+                        if exclude_pattern.search(code, context_start, context_end):
+                            is_excluded = True
+                            if debug_enabled:
+                                logger.debug(f"Excluding match '{match.group()}' due to safe pattern: {exclude_pattern.pattern}")
+                            break
+
+                    if is_excluded:
+                        continue
+
+                    # Category already at its cap: stop matching this category
+                    if category_count >= max_per_category:
+                        truncated = True
+                        break
+
+                    # Calculate line number
+                    if newline_offsets is None:
+                        newline_offsets = [m.start() for m in _NEWLINE.finditer(code)]
+                    line_number = bisect_right(newline_offsets, match_start) + 1
+
+                    append_finding({**template, "line_number": line_number})
+                    category_count += 1
+
+                if truncated:
+                    break
+
+            if truncated:
+                logger.debug(f"Truncated {vuln_type} findings in {filename} after {max_per_category}")
+                findings.append({
+                    **template,
+                    "description": (
+                        f"{description}: more than {max_per_category} "
+                        f"findings, further matches truncated"
+                        if category_count >= max_per_category else
+                        f"{description}: more than {max_matches} "
+                        f"matches, further matches not scanned"
+                    ),
+                })
 
         return findings
 
 
+# Extension -> file type, narrowest category first (python before backend,
+# javascript before web); anything unlisted is treated as backend
+_SKIP_EXTENSIONS = frozenset(SecurityScanner.SKIP_EXTENSIONS)
+_EXTENSION_TYPES: Dict[str, str] = {}
+for _file_type in ("python", "javascript", "web", "config"):
+    for _ext in SecurityScanner.SCANNABLE_EXTENSIONS[_file_type]:
+        _EXTENSION_TYPES.setdefault(_ext, _file_type)
+
+# Hyperscan flags: prefilter mode only guarantees a superset of matches,
+# which is all the candidate selection needs; UTF8/UCP follow str semantics
+_HS_FLAGS = (
+    hyperscan.HS_FLAG_CASELESS | hyperscan.HS_FLAG_MULTILINE | hyperscan.HS_FLAG_SINGLEMATCH
+    | hyperscan.HS_FLAG_UTF8 | hyperscan.HS_FLAG_UCP | hyperscan.HS_FLAG_PREFILTER
+) if HYPERSCAN_AVAILABLE else 0
+
+# Per-thread Hyperscan scratch space (scratch cannot be shared by concurrent scans)
+_hs_local = threading.local()
+
+
+def _build_hyperscan_database(sources: List[str]):
+    """Compile patterns into a block-mode Hyperscan database (ids = list index)"""
+    database = hyperscan.Database(mode=hyperscan.HS_MODE_BLOCK)
+    database.compile(
+        expressions=[source.encode("utf-8") for source in sources],
+        ids=list(range(len(sources))),
+        elements=len(sources),
+        flags=[_HS_FLAGS] * len(sources),
+    )
+    return database
+
+
+def _get_hyperscan_scratch(file_type: str, database):
+    """Get this thread's scratch space for a file type's database"""
+    scratches = getattr(_hs_local, "scratches", None)
+    if scratches is None:
+        scratches = _hs_local.scratches = {}
+    scratch = scratches.get(file_type)
+    if scratch is None:
+        scratch = scratches[file_type] = hyperscan.Scratch(database)
+    return scratch
+
+
+def _candidate_patterns(file_type: str, code: str, utf8: Optional[bytes]) -> Optional[Set[Tuple[str, int]]]:
+    """Find which (vuln_type, pattern_index) pairs can match in one pass
+
+    Args:
+        file_type: Detected file type
+        code: Source code to scan
+        utf8: code encoded as UTF-8, or None if it cannot be encoded
+
+    Returns:
+        Set of candidate patterns (empty if nothing can match), or None
+        when every applicable pattern has to be run
+    """
+    database = _HS_DATABASES.get(file_type)
+    if database is not None and utf8 is not None:
+        pattern_ids = _PATTERN_IDS[file_type]
+        matched: Set[Tuple[str, int]] = set()
+        database.scan(
+            utf8,
+            match_event_handler=lambda pid, start, end, flags, ctx: matched.add(pattern_ids[pid]),
+            scratch=_get_hyperscan_scratch(file_type, database),
+        )
+        return matched
+
+    # Fallback: one union alternation; no match means no pattern can match.
+    # Matches are still attributed by the per-pattern pass, because a single
+    # finditer over the union would drop overlapping matches.
+    prefilter = (_PREFILTERS if utf8 is not None else _PREFILTERS_RE).get(file_type)
+    if prefilter is not None and prefilter.search(code) is None:
+        return set()
+    return None
+
+
+# Static decision table: vulnerability types that apply to each file type
+_APPLICABLE_VULNS: Dict[str, List[Tuple[str, Dict]]] = {
+    file_type: [
+        (vuln_type, config)
+        for vuln_type, config in SecurityScanner.VULNERABILITY_PATTERNS.items()
+        if SecurityScanner.should_scan_for_vuln(file_type, config.get("file_types", ["backend"]))
+    ]
+    for file_type in SecurityScanner.SCANNABLE_EXTENSIONS
+}
+
+# Per file type: applicable (vuln_type, pattern_index) pairs, their union
+# alternation and (optionally) a Hyperscan database over the same patterns
+_PATTERN_IDS: Dict[str, List[Tuple[str, int]]] = {}
+_PREFILTERS = {}
+_PREFILTERS_RE: Dict[str, re.Pattern] = {}
+_HS_DATABASES = {}
+for _file_type, _applicable in _APPLICABLE_VULNS.items():
+    _ids = []
+    _sources = []
+    for _vuln_type, _config in _applicable:
+        for _index, _pattern in enumerate(_config["patterns"]):
+            _ids.append((_vuln_type, _index))
+            _sources.append(_pattern)
+    if not _sources:
+        continue
+
+    _PATTERN_IDS[_file_type] = _ids
+    _union = "|".join(f"(?:{p})" for p in _sources)
+    _PREFILTERS[_file_type] = _compile_pattern(_union, "im")
+    _PREFILTERS_RE[_file_type] = _compile_re(_union, "im") if RE2_AVAILABLE else _PREFILTERS[_file_type]
+    if HYPERSCAN_AVAILABLE:
+        try:
+            _HS_DATABASES[_file_type] = _build_hyperscan_database(_sources)
+        except hyperscan.error as e:
+            logger.warning(f"Hyperscan cannot compile {_file_type} security patterns ({e}), using regex prefilter")
+
+# Flat per-file-type scan table, compiled once at import (flags baked in):
+# (vuln_type, severity, description, recommendation, patterns, exclude_patterns)
+_VulnRecord = Tuple[str, str, str, str, Tuple[Any, ...], Tuple[Any, ...]]
+
+
+def _build_compiled_vulns(compile_pattern) -> Dict[str, Tuple[_VulnRecord, ...]]:
+    """Compile every vulnerability pattern with compile_pattern, grouped by file type"""
+    records: Dict[str, _VulnRecord] = {
+        vuln_type: (
+            vuln_type,
+            config["severity"],
+            config["description"],
+            config["recommendation"],
+            tuple(compile_pattern(pattern, "im") for pattern in config["patterns"]),
+            # re, not re2: re2's search(text, pos, endpos) re-encodes and
+            # scans all of text, which would make every exclude check O(file)
+            tuple(_compile_re(pattern, "i") for pattern in config.get("exclude_patterns", [])),
+        )
+        for vuln_type, config in SecurityScanner.VULNERABILITY_PATTERNS.items()
+    }
+    return {
+        file_type: tuple(records[vuln_type] for vuln_type, _ in applicable)
+        for file_type, applicable in _APPLICABLE_VULNS.items()
+    }
+
+
+# Patterns are re2 or re objects depending on availability; _COMPILED_VULNS_RE
+# always uses re, for code RE2 cannot take
+_COMPILED_VULNS = _build_compiled_vulns(_compile_pattern)
+_COMPILED_VULNS_RE = _build_compiled_vulns(_compile_re) if RE2_AVAILABLE else _COMPILED_VULNS
+
+
+@lru_cache(maxsize=16)
+def _get_validator(workspace_root: str) -> FileValidator:
+    """Get the FileValidator for a workspace, reused across self-heal iterations"""
+    return FileValidator(workspace_root)
+
+
+# Maximum threads used to scan artifacts concurrently
+MAX_SCAN_WORKERS = 8
+
+
+def _scan_artifacts(artifacts: List[Dict]) -> List[List[SecurityFinding]]:
+    """Scan artifacts for vulnerabilities, in parallel for multi-file outputs
+
+    Args:
+        artifacts: Coder artifacts with filename/content
+
+    Returns:
+        Findings per artifact, in artifact order
+    """
+    def scan(artifact: Dict) -> List[SecurityFinding]:
+        return SecurityScanner.scan_code(artifact.get("content", ""), artifact.get("filename", "unknown"))
+
+    if len(artifacts) <= 1:
+        return [scan(artifact) for artifact in artifacts]
+
+    with ThreadPoolExecutor(max_workers=min(MAX_SCAN_WORKERS, len(artifacts))) as executor:
+        return list(executor.map(scan, artifacts))
+
+
 def security_gate_node(state: QualityGateState) -> Dict:
     """Security Gate: Scan for vulnerabilities and validate paths
 
@@ -237,33 +539,40 @@ def security_gate_node(state: QualityGateState) -> Dict:
     """
     logger.info("🔒 Security Gate Node: Scanning for vulnerabilities...")
 
+    # Nothing to scan (e.g. review-only runs): pass without building a validator
+    coder_output = state.get("coder_output")
+    artifacts = coder_output.get("artifacts") if coder_output else None
+    if not artifacts:
+        logger.info("✅ No artifacts to scan - Security Gate PASSED")
+        return {
+            "current_node": "security_gate",
+            "security_findings": [],
+            "security_passed": True,
+        }
+
     workspace_root = state["workspace_root"]
-    validator = FileValidator(workspace_root)
+    validator = _get_validator(workspace_root)
 
     findings: List[SecurityFinding] = []
 
-    # Scan coder output if available
-    coder_output = state.get("coder_output")
-    if coder_output and "artifacts" in coder_output:
-        for artifact in coder_output["artifacts"]:
-            filename = artifact.get("filename", "unknown")
-            content = artifact.get("content", "")
-
-            # Validate file path
-            is_valid, error, _ = validator.validate_path(filename)
-            if not is_valid:
-                findings.append(SecurityFinding(
-                    severity="critical",
-                    category="path_traversal",
-                    description=f"Path validation failed: {error}",
-                    file_path=filename,
-                    line_number=None,
-                    recommendation="Ensure all paths are within workspace"
-                ))
-
-            # Scan code for vulnerabilities
-            code_findings = SecurityScanner.scan_code(content, filename)
-            findings.extend(code_findings)
+    scan_results = _scan_artifacts(artifacts)
+
+    for artifact, code_findings in zip(artifacts, scan_results):
+        filename = artifact.get("filename", "unknown")
+
+        # Validate file path
+        is_valid, error, _ = validator.validate_path(filename)
+        if not is_valid:
+            findings.append(SecurityFinding(
+                severity="critical",
+                category="path_traversal",
+                description=f"Path validation failed: {error}",
+                file_path=filename,
+                line_number=None,
+                recommendation="Ensure all paths are within workspace"
+            ))
+
+        findings.extend(code_findings)
 
     # Determine if security passed
     critical_findings = [f for f in findings if f["severity"] in ["critical", "high"]]
@@ -17,7 +17,7 @@ from app.agent.langgraph.nodes.supervisor import supervisor_node
 from app.agent.langgraph.nodes.security_gate import security_gate_node
 from app.agent.langgraph.nodes.aggregator import quality_aggregator_node
 from app.agent.langgraph.nodes.persistence import persistence_node
-from app.agent.langgraph.tools.context_manager import ContextManager
+from app.agent.langgraph.tools.context_manager import get_context_manager
 
 logger = logging.getLogger(__name__)
 
@@ -25,6 +25,11 @@ logger = logging.getLogger(__name__)
 class QualityGateWorkflow:
     """LangGraph workflow for production quality gates"""
 
+    # Intermediate checkpoints are never read (the final state comes from the
+    # "values" stream), so they are written once when the graph exits
+    # instead of after every node and self-heal iteration
+    CHECKPOINT_DURABILITY = "exit"
+
     def __init__(self):
         """Initialize quality gate workflow with LangGraph"""
         self.graph = self._build_graph()
@@ -90,7 +95,7 @@ class QualityGateWorkflow:
         logger.info("📂 Context Loader Node: Loading previous context...")
 
         workspace_root = state["workspace_root"]
-        context_mgr = ContextManager(workspace_root)
+        context_mgr = get_context_manager(workspace_root)
 
         previous_context = context_mgr.load_context()
 
@@ -210,7 +215,20 @@ class QualityGateWorkflow:
         config = {"configurable": {"thread_id": "quality_gate_1"}}
 
         try:
-            async for event in self.graph.astream(initial_state, config):
+            # "values" carries the full reduced state after each step; the
+            # last one is the final state, so it isn't read back from the
+            # checkpointer after the run
+            final_values = initial_state
+            async for mode, event in self.graph.astream(
+                initial_state,
+                config,
+                stream_mode=["updates", "values"],
+                durability=self.CHECKPOINT_DURABILITY,
+            ):
+                if mode == "values":
+                    final_values = event
+                    continue
+
                 # Extract node name and state updates
                 for node_name, node_output in event.items():
                     logger.info(f"📍 Node '{node_name}' completed")
@@ -223,10 +241,9 @@ class QualityGateWorkflow:
                     }
 
             # Final status
-            final_state = await self.graph.aget_state(config)
             yield {
                 "node": "END",
-                "updates": final_state.values,
+                "updates": final_values,
                 "status": "completed"
             }
 
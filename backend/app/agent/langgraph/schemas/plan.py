@@ -4,12 +4,20 @@ Defines data structures for the Plan Mode with Approval Workflow.
 Plans are created before code generation and require user approval.
 """
 
+import sys
 import uuid
+from collections import Counter
 from datetime import datetime
 from dataclasses import dataclass, field
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Set, Tuple
 from enum import Enum
 
+try:
+    import msgspec
+    MSGSPEC_AVAILABLE = True
+except ImportError:
+    MSGSPEC_AVAILABLE = False
+
 
 class PlanAction(str, Enum):
     """Types of actions a plan step can perform"""
@@ -49,7 +57,37 @@ class PlanComplexity(str, Enum):
     HIGH = "high"
 
 
-@dataclass
+# Plain string values used by the ExecutionPlan methods; reading .value on an
+# Enum member goes through a descriptor lookup on every access
+_STATUS_PENDING = StepStatus.PENDING.value
+_STATUS_IN_PROGRESS = StepStatus.IN_PROGRESS.value
+_STATUS_COMPLETED = StepStatus.COMPLETED.value
+_STATUS_FAILED = StepStatus.FAILED.value
+_APPROVAL_APPROVED = PlanApprovalStatus.APPROVED.value
+_APPROVAL_REJECTED = PlanApprovalStatus.REJECTED.value
+_APPROVAL_MODIFIED = PlanApprovalStatus.MODIFIED.value
+
+# Canonical, interned action and complexity values, so every step shares the
+# same string objects. Labels outside the enums are kept as given
+_ACTIONS = {action.value: sys.intern(action.value) for action in PlanAction}
+_COMPLEXITIES = {level.value: sys.intern(level.value) for level in PlanComplexity}
+
+
+def _canonical(value: Any, canonical: Dict[str, str]) -> Any:
+    """Map a value onto its canonical string, ignoring case and padding"""
+    found = canonical.get(value)
+    if found is not None:
+        return found
+    if isinstance(value, str):
+        return canonical.get(value.strip().lower(), value)
+    return value
+
+
+# Bound once; timestamps are taken on every step transition
+_utcnow = datetime.utcnow
+
+
+@dataclass(slots=True)
 class PlanStep:
     """A single step in the execution plan
 
@@ -76,6 +114,10 @@ class PlanStep:
     output: Optional[str] = None
     error: Optional[str] = None
 
+    def __post_init__(self):
+        self.action = _canonical(self.action, _ACTIONS)
+        self.estimated_complexity = _canonical(self.estimated_complexity, _COMPLEXITIES)
+
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary for JSON serialization"""
         return {
@@ -94,6 +136,12 @@ class PlanStep:
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> "PlanStep":
         """Create from dictionary"""
+        if MSGSPEC_AVAILABLE:
+            try:
+                return msgspec.convert(data, cls)
+            except msgspec.ValidationError:
+                pass  # Incomplete or loosely typed data: fill in defaults below
+
         return cls(
             step=data.get("step", 0),
             action=data.get("action", "custom"),
@@ -108,7 +156,7 @@ class PlanStep:
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class ExecutionPlan:
     """Complete execution plan for a user request
 
@@ -149,6 +197,11 @@ class ExecutionPlan:
     execution_started_at: Optional[str] = None
     execution_completed_at: Optional[str] = None
     current_step: int = 0
+    # Cached (steps list, length, step number -> step); rebuilt whenever
+    # self.steps is replaced or resized
+    _step_index: Optional[Tuple[List[PlanStep], int, Dict[int, PlanStep]]] = field(
+        default=None, init=False, repr=False, compare=False
+    )
 
     @classmethod
     def create(
@@ -163,7 +216,7 @@ class ExecutionPlan:
         return cls(
             plan_id=f"plan-{uuid.uuid4().hex[:8]}",
             session_id=session_id,
-            created_at=datetime.utcnow().isoformat(),
+            created_at=_utcnow().isoformat(),
             user_request=user_request,
             steps=steps,
             estimated_files=estimated_files,
@@ -195,6 +248,12 @@ class ExecutionPlan:
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> "ExecutionPlan":
         """Create from dictionary"""
+        if MSGSPEC_AVAILABLE:
+            try:
+                return msgspec.convert(data, cls)
+            except msgspec.ValidationError:
+                pass  # Incomplete or loosely typed data: fill in defaults below
+
         steps = [PlanStep.from_dict(s) for s in data.get("steps", [])]
         return cls(
             plan_id=data.get("plan_id", ""),
@@ -217,92 +276,106 @@ class ExecutionPlan:
 
     def approve(self, approved_by: str = "user") -> None:
         """Mark plan as approved"""
-        self.approval_status = PlanApprovalStatus.APPROVED.value
-        self.approved_at = datetime.utcnow().isoformat()
+        self.approval_status = _APPROVAL_APPROVED
+        self.approved_at = _utcnow().isoformat()
         self.approved_by = approved_by
 
     def reject(self, reason: str) -> None:
         """Mark plan as rejected"""
-        self.approval_status = PlanApprovalStatus.REJECTED.value
+        self.approval_status = _APPROVAL_REJECTED
         self.rejection_reason = reason
 
     def modify(self, new_steps: List[PlanStep], modification_note: str = "") -> None:
         """Update plan with modified steps"""
         self.steps = new_steps
         self.total_steps = len(new_steps)
-        self.approval_status = PlanApprovalStatus.MODIFIED.value
+        self.approval_status = _APPROVAL_MODIFIED
         self.modifications.append({
-            "timestamp": datetime.utcnow().isoformat(),
+            "timestamp": _utcnow().isoformat(),
             "note": modification_note,
             "step_count": len(new_steps),
         })
 
     def start_execution(self) -> None:
         """Mark execution as started"""
-        self.execution_started_at = datetime.utcnow().isoformat()
+        self.execution_started_at = _utcnow().isoformat()
         if self.steps:
-            self.steps[0].status = StepStatus.IN_PROGRESS.value
+            self.steps[0].status = _STATUS_IN_PROGRESS
             self.current_step = 1
 
+    def _get_step(self, step_num: int) -> Optional[PlanStep]:
+        """Look up a step by number (first step with that number wins)"""
+        steps = self.steps
+        cached = self._step_index
+        if cached is None or cached[0] is not steps or cached[1] != len(steps):
+            index: Dict[int, PlanStep] = {}
+            for step in steps:
+                index.setdefault(step.step, step)
+            cached = self._step_index = (steps, len(steps), index)
+        return cached[2].get(step_num)
+
     def complete_step(self, step_num: int, output: str = "") -> None:
         """Mark a step as completed"""
-        for step in self.steps:
-            if step.step == step_num:
-                step.status = StepStatus.COMPLETED.value
-                step.output = output
-                break
+        step = self._get_step(step_num)
+        if step is not None:
+            step.status = _STATUS_COMPLETED
+            step.output = output
 
         # Move to next step
         if step_num < self.total_steps:
             self.current_step = step_num + 1
-            for step in self.steps:
-                if step.step == step_num + 1:
-                    step.status = StepStatus.IN_PROGRESS.value
-                    break
+            next_step = self._get_step(step_num + 1)
+            if next_step is not None:
+                next_step.status = _STATUS_IN_PROGRESS
         else:
             # All steps completed
-            self.execution_completed_at = datetime.utcnow().isoformat()
+            self.execution_completed_at = _utcnow().isoformat()
 
     def fail_step(self, step_num: int, error: str) -> None:
         """Mark a step as failed"""
-        for step in self.steps:
-            if step.step == step_num:
-                step.status = StepStatus.FAILED.value
-                step.error = error
-                break
+        step = self._get_step(step_num)
+        if step is not None:
+            step.status = _STATUS_FAILED
+            step.error = error
 
     def get_next_step(self) -> Optional[PlanStep]:
         """Get the next pending step"""
+        # Numbers of completed steps, built on the first step with dependencies
+        completed: Optional[Set[int]] = None
+
         for step in self.steps:
-            if step.status == StepStatus.PENDING.value:
+            if step.status == _STATUS_PENDING:
+                if not step.dependencies:
+                    return step
+
                 # Check dependencies
-                deps_met = all(
-                    any(s.step == dep and s.status == StepStatus.COMPLETED.value
-                        for s in self.steps)
-                    for dep in step.dependencies
-                )
-                if deps_met or not step.dependencies:
+                if completed is None:
+                    completed = {s.step for s in self.steps if s.status == _STATUS_COMPLETED}
+                if all(dep in completed for dep in step.dependencies):
                     return step
         return None
 
     def get_progress(self) -> Dict[str, Any]:
         """Get execution progress summary"""
-        completed = sum(1 for s in self.steps if s.status == StepStatus.COMPLETED.value)
-        failed = sum(1 for s in self.steps if s.status == StepStatus.FAILED.value)
-        in_progress = sum(1 for s in self.steps if s.status == StepStatus.IN_PROGRESS.value)
+        # Single pass over the steps
+        counts = Counter(s.status for s in self.steps)
+        completed = counts[_STATUS_COMPLETED]
+        failed = counts[_STATUS_FAILED]
+        in_progress = counts[_STATUS_IN_PROGRESS]
+        total = self.total_steps
 
         return {
-            "total_steps": self.total_steps,
+            "total_steps": total,
             "completed": completed,
             "failed": failed,
             "in_progress": in_progress,
-            "pending": self.total_steps - completed - failed - in_progress,
-            "progress_percent": (completed / self.total_steps * 100) if self.total_steps > 0 else 0,
+            "pending": total - completed - failed - in_progress,
+            "progress_percent": (completed / total * 100) if total > 0 else 0,
             "current_step": self.current_step,
         }
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class PlanGenerationRequest:
     """Request to generate a new plan"""
     user_request: str
@@ -311,7 +384,7 @@ class PlanGenerationRequest:
     context: Optional[Dict[str, Any]] = None
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class PlanApprovalRequest:
     """Request to approve/reject/modify a plan"""
     plan_id: str
@@ -3,9 +3,36 @@
 Implements type-safe state management following LangGraph best practices.
 """
 
-from typing import TypedDict, Literal, List, Dict, Optional, Annotated, Any
+from typing import TypedDict, Literal, List, Dict, Optional, Annotated, Any, Tuple
 from datetime import datetime
-from operator import add
+
+from app.core.config import settings
+
+
+def append_list(left: List, right: List) -> List:
+    """Append-only list reducer (operator.add without the copy for empty updates)
+
+    Never mutates either operand: LangGraph shares channel values between
+    channel copies, so the merged list must be a new object.
+    """
+    if not right:
+        return left
+    return left + right
+
+
+def append_debug_logs(left: List, right: List) -> List:
+    """Append-only reducer for debug_logs that keeps the last settings.debug_log_cap entries
+
+    Every checkpoint serializes the whole list, so it is bounded across
+    refinement loops.
+    """
+    if not right:
+        return left
+    merged = left + right
+    cap = settings.debug_log_cap
+    if len(merged) > cap:
+        return merged[-cap:]
+    return merged
 
 
 # Type aliases for clarity
@@ -37,8 +64,8 @@ class TestResult(TypedDict):
 class ReviewFeedback(TypedDict):
     """Code review feedback"""
     approved: bool
-    issues: Annotated[List[str], add]  # FIXED: Use append-only list
-    suggestions: Annotated[List[str], add]  # FIXED: Use append-only list
+    issues: Annotated[List[str], append_list]  # FIXED: Use append-only list
+    suggestions: Annotated[List[str], append_list]  # FIXED: Use append-only list
     quality_score: float  # 0.0 - 1.0
     critique: Optional[str]  # Detailed critique text
 
@@ -74,11 +101,39 @@ class DebugLog(TypedDict):
     token_usage: Optional[Dict[str, int]]  # {prompt_tokens, completion_tokens, total_tokens}
 
 
+# Raw debug event: (timestamp, node, agent, event_type, payload)
+DebugLogTuple = Tuple[str, str, str, str, Dict[str, Any]]
+
+
+def debug_log_from_tuple(entry: DebugLogTuple) -> DebugLog:
+    """Expand a raw debug event tuple into a DebugLog
+
+    Nodes that emit many events buffer cheap tuples and only build the
+    DebugLog entries (including the stringified content) when returning.
+
+    Args:
+        entry: (timestamp, node, agent, event_type, payload) tuple
+
+    Returns:
+        DebugLog with the payload as content and metadata
+    """
+    timestamp, node, agent, event_type, payload = entry
+    return DebugLog(
+        timestamp=timestamp,
+        node=node,
+        agent=agent,
+        event_type=event_type,
+        content=str(payload),
+        metadata=payload,
+        token_usage=None
+    )
+
+
 class QualityGateState(TypedDict, total=False):
     """LangGraph state for production quality gates
 
     This state flows through all nodes in the workflow.
-    Uses Annotated[List, add] for reducer pattern (append-only lists).
+    Uses Annotated[List, append_list] for reducer pattern (append-only lists).
     """
 
     # ==================== Input ====================
@@ -98,8 +153,8 @@ class QualityGateState(TypedDict, total=False):
 
     # ==================== Agent Outputs ====================
     coder_output: Optional[Dict]  # From CodingAgent node
-    security_findings: Annotated[List[SecurityFinding], add]  # Append-only
-    qa_test_results: Annotated[List[TestResult], add]  # Append-only
+    security_findings: Annotated[List[SecurityFinding], append_list]  # Append-only
+    qa_test_results: Annotated[List[TestResult], append_list]  # Append-only
     review_feedback: Optional[ReviewFeedback]  # From ReviewAgent node
 
     # ==================== Quality Gates ====================
@@ -112,9 +167,9 @@ class QualityGateState(TypedDict, total=False):
     execution_mode: Literal["sequential", "parallel"]
 
     # ==================== Final Result ====================
-    final_artifacts: Annotated[List[Artifact], add]  # All generated/modified files
+    final_artifacts: Annotated[List[Artifact], append_list]  # All generated/modified files
     workflow_status: WorkflowStatus
-    error_log: Annotated[List[str], add]  # All errors encountered
+    error_log: Annotated[List[str], append_list]  # All errors encountered
 
     # ==================== Metadata ====================
     started_at: str  # ISO 8601 timestamp
@@ -127,10 +182,10 @@ class QualityGateState(TypedDict, total=False):
 
     # ==================== Refinement Cycle (NEW) ====================
     refiner_output: Optional[Dict]  # From RefinerAgent node
-    code_diffs: Annotated[List[CodeDiff], add]  # All code diffs generated
+    code_diffs: Annotated[List[CodeDiff], append_list]  # All code diffs generated
     is_fixed: bool  # True if refiner successfully fixed issues
     refinement_iteration: int  # Number of refinement loops
-    review_results: Annotated[List[str], add]  # CRITICAL: All review results (prevents data loss)
+    review_results: Annotated[List[str], append_list]  # CRITICAL: All review results (prevents data loss)
     rca_analysis: Optional[str]  # Root Cause Analysis from DeepSeek-R1
     last_failure_reason: Optional[str]  # Why last iteration failed
 
@@ -140,14 +195,14 @@ class QualityGateState(TypedDict, total=False):
     pending_diffs: List[CodeDiff]  # Diffs awaiting approval
 
     # ==================== Observability & Debug (NEW) ====================
-    debug_logs: Annotated[List[DebugLog], add]  # All debug logs
+    debug_logs: Annotated[List[DebugLog], append_debug_logs]  # Most recent settings.debug_log_cap debug logs
     enable_debug: bool  # Whether to collect debug logs
     current_prompt: Optional[str]  # Current prompt being executed
     current_thinking: Optional[str]  # Current agent thinking process
 
     # ==================== Supervisor Analysis (NEW) ====================
     supervisor_analysis: Optional[Dict[str, Any]]  # Full supervisor analysis result
-    thinking_stream: Annotated[List[str], add]  # DeepSeek-R1 <think> blocks (append-only)
+    thinking_stream: Annotated[List[str], append_list]  # DeepSeek-R1 <think> blocks (append-only)
     workflow_strategy: Optional[str]  # linear, parallel_gates, adaptive_loop, staged_approval
     required_agents: List[str]  # List of required agent capabilities
     task_complexity: Optional[str]  # simple, moderate, complex, critical
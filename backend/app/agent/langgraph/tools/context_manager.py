@@ -5,16 +5,61 @@ Handles loading and saving workflow state to enable context resumption.
 
 import json
 import logging
+import os
+import uuid
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, Optional, List
+from typing import Dict, Optional, List, Tuple
 from datetime import datetime
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 logger = logging.getLogger(__name__)
 
+# Bound once; timestamps are taken on every save and execution record
+_utcnow = datetime.utcnow
+
+# Same layout as json.dump(indent=2, ensure_ascii=False); non-str keys are
+# stringified like the json module does
+_ORJSON_OPTIONS = (orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS) if ORJSON_AVAILABLE else 0
+
+
+def _decode_context(data: bytes) -> Dict:
+    """Parse .ai_context.json content"""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    return json.loads(data.decode('utf-8'))
+
+
+def _encode_context(context: Dict) -> bytes:
+    """Serialize context as indented UTF-8 JSON"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(context, option=_ORJSON_OPTIONS)
+    return json.dumps(context, indent=2, ensure_ascii=False).encode('utf-8')
+
+
+def _copy_context(context: Dict) -> Dict:
+    """Copy a context dict and its top-level lists and dicts
+
+    Callers append to or replace top-level entries (workflow_history,
+    next_recommended_tasks); values nested deeper are shared.
+    """
+    return {
+        key: value.copy() if isinstance(value, (list, dict)) else value
+        for key, value in context.items()
+    }
+
 
 class ContextManager:
     """Manages .ai_context.json for stateful workflow persistence"""
 
+    # Most recent workflow executions kept in workflow_history
+    MAX_WORKFLOW_HISTORY = 50
+
     def __init__(self, workspace_root: str):
         """Initialize context manager
 
@@ -24,6 +69,39 @@ class ContextManager:
         self.workspace_root = Path(workspace_root)
         self.context_file = self.workspace_root / ".ai_context.json"
 
+        # Parsed context, valid while the file's (mtime_ns, size) is unchanged
+        self._cache: Optional[Dict] = None
+        self._cache_signature: Optional[Tuple[int, int]] = None
+
+    def _file_signature(self) -> Optional[Tuple[int, int]]:
+        """Get (mtime_ns, size) of the context file, or None if it does not exist"""
+        try:
+            stat = self.context_file.stat()
+        except FileNotFoundError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size)
+
+    def _read_context(self) -> Optional[Dict]:
+        """Read the context file, reusing the parsed dict while it is unchanged
+
+        Callers get a copy from _copy_context, so appending to or replacing
+        its entries reaches neither the cache nor earlier loads; a deep copy
+        would cost more than parsing the file again.
+
+        Returns:
+            Context dict if file exists, None otherwise
+        """
+        signature = self._file_signature()
+        if signature is None:
+            self._cache = None
+            return None
+
+        if self._cache is None or signature != self._cache_signature:
+            self._cache = _decode_context(self.context_file.read_bytes())
+            self._cache_signature = signature
+
+        return _copy_context(self._cache)
+
     def load_context(self) -> Optional[Dict]:
         """Load existing context from .ai_context.json
 
@@ -31,13 +109,11 @@ class ContextManager:
             Context dict if file exists, None otherwise
         """
         try:
-            if not self.context_file.exists():
+            context = self._read_context()
+            if context is None:
                 logger.info(f"No existing context found at {self.context_file}")
                 return None
 
-            with open(self.context_file, 'r', encoding='utf-8') as f:
-                context = json.load(f)
-
             logger.info(f"✅ Loaded context from {self.context_file}")
             logger.info(f"   Last updated: {context.get('last_updated', 'unknown')}")
             logger.info(f"   Project: {context.get('project_name', 'unknown')}")
@@ -48,6 +124,18 @@ class ContextManager:
             logger.error(f"❌ Failed to load context: {e}")
             return None
 
+    def _write_atomic(self, data: bytes) -> None:
+        """Replace the context file with data in a single rename"""
+        tmp_file = self.context_file.with_name(
+            f"{self.context_file.name}.{os.getpid()}.{uuid.uuid4().hex[:8]}.tmp"
+        )
+        try:
+            tmp_file.write_bytes(data)
+            os.replace(tmp_file, self.context_file)
+        except BaseException:
+            tmp_file.unlink(missing_ok=True)
+            raise
+
     def save_context(
         self,
         context: Dict,
@@ -63,26 +151,31 @@ class ContextManager:
             True if saved successfully, False otherwise
         """
         try:
-            # Load existing context if merging
-            if merge and self.context_file.exists():
-                with open(self.context_file, 'r', encoding='utf-8') as f:
-                    existing = json.load(f)
+            # Load existing context if merging (from the cache when unchanged)
+            existing = self._read_context() if merge else None
+            if existing is not None:
                 # Merge (new context takes precedence)
                 existing.update(context)
                 context = existing
 
             # Update timestamp
-            context['last_updated'] = datetime.utcnow().isoformat()
+            context['last_updated'] = _utcnow().isoformat()
 
-            # Write to file
+            # Write to a temp file and rename it over the context file, so
+            # readers never see a partially written file
             self.context_file.parent.mkdir(parents=True, exist_ok=True)
-            with open(self.context_file, 'w', encoding='utf-8') as f:
-                json.dump(context, f, indent=2, ensure_ascii=False)
+            self._write_atomic(_encode_context(context))
+
+            # What was just written is the current file content; copied so
+            # later changes to the caller's dict do not leak into the cache
+            self._cache = _copy_context(context)
+            self._cache_signature = self._file_signature()
 
             logger.info(f"✅ Saved context to {self.context_file}")
             return True
 
         except Exception as e:
+            self._cache = None
             logger.error(f"❌ Failed to save context: {e}")
             return False
 
@@ -115,7 +208,7 @@ class ContextManager:
 
             # Add execution record
             execution = {
-                'timestamp': datetime.utcnow().isoformat(),
+                'timestamp': _utcnow().isoformat(),
                 'workflow_type': workflow_type,
                 'status': status,
                 'duration_ms': duration_ms,
@@ -123,10 +216,14 @@ class ContextManager:
                 'notes': notes
             }
 
-            context['workflow_history'].append(execution)
+            history = context['workflow_history']
+            history.append(execution)
 
-            # Keep only last 50 executions
-            context['workflow_history'] = context['workflow_history'][-50:]
+            # Keep only the most recent executions; trimmed in place, and at
+            # steady state this drops a single entry
+            overflow = len(history) - self.MAX_WORKFLOW_HISTORY
+            if overflow > 0:
+                del history[:overflow]
 
             return self.save_context(context, merge=False)
 
@@ -179,3 +276,13 @@ class ContextManager:
             return []
 
         return context.get('known_issues', [])
+
+
+@lru_cache(maxsize=16)
+def get_context_manager(workspace_root: str) -> ContextManager:
+    """Get the shared ContextManager for a workspace
+
+    Reusing one manager per workspace lets loads in later nodes and
+    iterations hit its parsed-context cache instead of re-reading the file.
+    """
+    return ContextManager(workspace_root)
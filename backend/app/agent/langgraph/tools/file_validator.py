@@ -4,13 +4,36 @@ Prevents path traversal and ensures all file operations stay within workspace.
 """
 
 import os
+import fnmatch
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Tuple, List
+from typing import Iterator, Tuple, List
 
 logger = logging.getLogger(__name__)
 
 
+def _iter_matching_files(root: str, pattern: str) -> Iterator[str]:
+    """Walk root with os.scandir, yielding files whose name matches pattern
+
+    Equivalent to rglob(pattern) + is_file() for single-component patterns:
+    symlinked directories are not descended into, symlinked files are kept.
+    DirEntry caches the file type from readdir, so most entries need no stat.
+    """
+    stack = [root]
+    while stack:
+        directory = stack.pop()
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                    elif fnmatch.fnmatch(entry.name, pattern) and entry.is_file():
+                        yield entry.path
+        except OSError as e:
+            logger.debug(f"Skipping unreadable directory {directory}: {e}")
+
+
 class FileValidator:
     """Validates file paths for security and sandboxing"""
 
@@ -31,6 +54,14 @@ class FileValidator:
         "/boot",
     ]
 
+    # Forbidden paths as a tuple, so one str.startswith call checks them all
+    _FORBIDDEN_PREFIXES = tuple(FORBIDDEN_PATHS)
+
+    # Batches at least this large are resolved on a thread pool
+    # (resolve() is syscall-bound and releases the GIL)
+    PARALLEL_VALIDATION_THRESHOLD = 32
+    MAX_VALIDATION_WORKERS = 8
+
     def __init__(self, workspace_root: str):
         """Initialize file validator
 
@@ -45,6 +76,10 @@ class FileValidator:
         if not self.workspace_root.is_dir():
             raise ValueError(f"Workspace root is not a directory: {workspace_root}")
 
+        # Resolved root with a trailing separator, for prefix containment checks
+        self._workspace_str = str(self.workspace_root)
+        self._workspace_prefix = os.path.join(self._workspace_str, "")
+
         logger.info(f"🔒 FileValidator initialized: {self.workspace_root}")
 
     def validate_path(self, file_path: str) -> Tuple[bool, str, Path]:
@@ -77,25 +112,24 @@ class FileValidator:
 
             # Check if resolved path starts with forbidden paths
             resolved_str = str(resolved)
-            for forbidden in self.FORBIDDEN_PATHS:
-                if resolved_str.startswith(forbidden):
-                    return (
-                        False,
-                        f"Path points to forbidden system directory: {resolved_str}",
-                        Path()
-                    )
+            if resolved_str.startswith(self._FORBIDDEN_PREFIXES):
+                return (
+                    False,
+                    f"Path points to forbidden system directory: {resolved_str}",
+                    Path()
+                )
 
-            # CRITICAL: Check if resolved path is within workspace
-            try:
-                resolved.relative_to(self.workspace_root)
-            except ValueError:
+            # CRITICAL: Check if resolved path is within workspace. Both sides
+            # are fully resolved, so symlinks cannot escape a string prefix check
+            if resolved_str != self._workspace_str and not resolved_str.startswith(self._workspace_prefix):
                 return (
                     False,
                     f"Path escapes workspace boundary: {resolved_str} is outside {self.workspace_root}",
                     Path()
                 )
 
-            logger.debug(f"✅ Path validated: {file_path} → {resolved}")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(f"✅ Path validated: {file_path} → {resolved}")
             return (True, "", resolved)
 
         except Exception as e:
@@ -114,8 +148,19 @@ class FileValidator:
         error_messages = []
         resolved_paths = []
 
+        # Repeated paths are resolved once per batch. Nothing is kept across
+        # calls, so symlinks changed between batches are always re-checked
+        unique_paths = list(dict.fromkeys(file_paths))
+        if len(unique_paths) < self.PARALLEL_VALIDATION_THRESHOLD:
+            unique_results = [self.validate_path(path) for path in unique_paths]
+        else:
+            # pool.map keeps results in input order
+            with ThreadPoolExecutor(max_workers=self.MAX_VALIDATION_WORKERS) as pool:
+                unique_results = list(pool.map(self.validate_path, unique_paths))
+        results_by_path = dict(zip(unique_paths, unique_results))
+
         for path in file_paths:
-            is_valid, error, resolved = self.validate_path(path)
+            is_valid, error, resolved = results_by_path[path]
             if not is_valid:
                 all_valid = False
                 error_messages.append(error)
@@ -165,14 +210,33 @@ class FileValidator:
         Returns:
             List of file paths within workspace
         """
+        return [Path(p) for p in self.list_workspace_file_strs(pattern, recursive)]
+
+    def list_workspace_file_strs(self, pattern: str = "*", recursive: bool = True) -> List[str]:
+        """List files in workspace matching pattern, as path strings
+
+        Same matching as list_workspace_files, without building a Path per
+        file for callers that only log, filter or hash the paths.
+
+        Args:
+            pattern: Glob pattern (e.g., "*.py", "src/**/*.ts")
+            recursive: Whether to search recursively
+
+        Returns:
+            List of absolute file path strings within workspace
+        """
         try:
-            if recursive:
-                files = list(self.workspace_root.rglob(pattern))
+            if recursive and "/" not in pattern and os.sep not in pattern and "**" not in pattern:
+                # Name-only pattern: single scandir walk, no per-entry stat
+                files = list(_iter_matching_files(self._workspace_str, pattern))
             else:
-                files = list(self.workspace_root.glob(pattern))
+                if recursive:
+                    matches = self.workspace_root.rglob(pattern)
+                else:
+                    matches = self.workspace_root.glob(pattern)
 
-            # Filter out directories, keep only files
-            files = [f for f in files if f.is_file()]
+                # Filter out directories, keep only files
+                files = [str(f) for f in matches if f.is_file()]
 
             logger.info(f"📁 Found {len(files)} files matching '{pattern}'")
             return files
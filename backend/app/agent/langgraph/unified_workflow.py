@@ -11,19 +11,20 @@ This is the EXECUTABLE workflow that integrates:
 CRITICAL: This workflow performs REAL operations, not simulations.
 """
 
+import asyncio
 import logging
-from typing import AsyncGenerator, Dict, Literal
+import uuid
+from collections import OrderedDict
+from typing import Any, AsyncGenerator, Dict, Tuple
 from datetime import datetime
-from langgraph.graph import StateGraph, START, END
-from langgraph.checkpoint.memory import MemorySaver
 
-from app.agent.langgraph.schemas.state import QualityGateState, create_initial_state, DebugLog
-from app.agent.langgraph.tools.context_manager import ContextManager
+from app.agent.langgraph.schemas.state import create_initial_state
 from app.agent.langgraph.tools.filesystem_tools import FILESYSTEM_TOOLS
+from app.utils.timestamps import CachedTimestamp
 
 # Import Supervisor-Led Dynamic Workflow components
 from core.supervisor import SupervisorAgent
-from core.workflow import DynamicWorkflowBuilder, create_workflow_from_supervisor_analysis
+from core.workflow import create_workflow_from_supervisor_analysis
 from core.agent_registry import get_registry
 
 logger = logging.getLogger(__name__)
@@ -41,15 +42,92 @@ class UnifiedLangGraphWorkflow:
     - Debug logging
     """
 
+    # Compiled graphs kept for reuse across requests with the same shape
+    GRAPH_CACHE_SIZE = 32
+
+    # Write each checkpoint before the next step starts. The default "async"
+    # mode chains pending puts so every earlier checkpoint stays referenced
+    # until the run ends, growing memory with each refinement loop; the
+    # in-memory writes are cheap enough that blocking on them is a net win
+    CHECKPOINT_DURABILITY = "sync"
+
+    # Event timestamps are reused within this window (seconds); token and
+    # thinking streams yield far more often than that
+    TIMESTAMP_RESOLUTION = 0.01
+
+    # Bounds for the per-run superstep budget derived in _recursion_limit
+    MIN_RECURSION_LIMIT = 10
+    MAX_RECURSION_LIMIT = 500
+
     def __init__(self):
         """Initialize unified workflow"""
         self.supervisor = SupervisorAgent()
-        self.workflow_builder = DynamicWorkflowBuilder()
         self.agent_registry = get_registry()
         self.tools = FILESYSTEM_TOOLS
-        self.graph = None  # Will be built dynamically per request
+        self._graph_cache: "OrderedDict[Tuple, Any]" = OrderedDict()
+        self._timestamp = CachedTimestamp(self.TIMESTAMP_RESOLUTION)
         logger.info("✅ UnifiedLangGraphWorkflow initialized with Supervisor")
 
+    @property
+    def compiled_graphs(self) -> int:
+        """Number of compiled workflow graphs currently cached"""
+        return len(self._graph_cache)
+
+    def now_iso(self) -> str:
+        """Get the current UTC timestamp, refreshed at most every TIMESTAMP_RESOLUTION
+
+        Returns:
+            ISO formatted timestamp string
+        """
+        return self._timestamp.now_iso()
+
+    def _recursion_limit(self, workflow_graph, max_iterations: int) -> int:
+        """Derive the superstep budget for a run from the graph's size
+
+        Each refinement iteration runs every node at most once, so the
+        budget is the node count (plus START and a spare step) per iteration,
+        including the initial pass.
+
+        Args:
+            workflow_graph: Compiled graph about to run
+            max_iterations: Maximum refinement iterations
+
+        Returns:
+            Recursion limit clamped to [MIN_RECURSION_LIMIT, MAX_RECURSION_LIMIT]
+        """
+        limit = (len(workflow_graph.nodes) + 1) * (max_iterations + 1)
+        return max(self.MIN_RECURSION_LIMIT, min(limit, self.MAX_RECURSION_LIMIT))
+
+    def _get_workflow_graph(self, supervisor_analysis: Dict):
+        """Get the compiled graph for an analysis, building it on first use
+
+        The graph only depends on the strategy, the required agents and
+        whether approval is required, so analyses of the same shape share
+        one compiled graph (LRU, GRAPH_CACHE_SIZE entries).
+
+        Args:
+            supervisor_analysis: Supervisor's analysis
+
+        Returns:
+            Compiled LangGraph ready for execution
+        """
+        key = (
+            supervisor_analysis.get("workflow_strategy", "linear"),
+            tuple(supervisor_analysis.get("required_agents", [])),
+            bool(supervisor_analysis.get("requires_human_approval", False)),
+        )
+
+        workflow_graph = self._graph_cache.get(key)
+        if workflow_graph is not None:
+            self._graph_cache.move_to_end(key)
+            logger.info(f"♻️  Reusing compiled workflow for {key[0]}")
+            return workflow_graph
+
+        workflow_graph = create_workflow_from_supervisor_analysis(supervisor_analysis)
+        self._graph_cache[key] = workflow_graph
+        if len(self._graph_cache) > self.GRAPH_CACHE_SIZE:
+            self._graph_cache.popitem(last=False)
+        return workflow_graph
 
     async def execute(
         self,
@@ -78,12 +156,16 @@ class UnifiedLangGraphWorkflow:
             enable_debug: Whether to enable debug logging
 
         Yields:
-            State updates from each node, including Supervisor analysis and thinking stream
+            State updates from each node, including Supervisor analysis and thinking stream,
+            plus "streaming" updates for tokens nodes emit via get_stream_writer
         """
         logger.info(f"🚀 Starting Supervisor-Led Workflow Execution")
         logger.info(f"   Request: {user_request[:100]}")
         logger.info(f"   Workspace: {workspace_root}")
 
+        workflow_graph = None
+        config = None
+
         try:
             # STEP 1: Supervisor analyzes request using DeepSeek-R1 with streaming
             logger.info("🧠 Step 1/3: Supervisor Analysis (DeepSeek-R1 with streaming)")
@@ -105,15 +187,16 @@ class UnifiedLangGraphWorkflow:
                             "thinking_complete": update.get("is_complete", False),
                         },
                         "status": "thinking",
-                        "timestamp": datetime.utcnow().isoformat()
+                        "timestamp": self.now_iso()
                     }
 
                 elif update["type"] == "analysis":
                     supervisor_analysis = update["content"]
 
-            # Fallback to sync if async failed
+            # Fallback to sync analysis if async failed; run it in a worker
+            # thread so the LLM call doesn't block the event loop
             if not supervisor_analysis:
-                supervisor_analysis = self.supervisor.analyze_request(user_request)
+                supervisor_analysis = await asyncio.to_thread(self.supervisor.analyze_request, user_request)
 
             # Yield complete Supervisor analysis to frontend
             yield {
@@ -128,7 +211,7 @@ class UnifiedLangGraphWorkflow:
                     "api_used": supervisor_analysis.get("api_used", False),
                 },
                 "status": "running",
-                "timestamp": datetime.utcnow().isoformat()
+                "timestamp": self.now_iso()
             }
 
             logger.info(f"✅ Supervisor Analysis Complete:")
@@ -139,7 +222,7 @@ class UnifiedLangGraphWorkflow:
 
             # STEP 2: Build dynamic workflow graph
             logger.info("🏗️  Step 2/3: Building Dynamic Workflow")
-            workflow_graph = create_workflow_from_supervisor_analysis(supervisor_analysis)
+            workflow_graph = self._get_workflow_graph(supervisor_analysis)
 
             # Yield workflow graph info to frontend
             yield {
@@ -152,7 +235,7 @@ class UnifiedLangGraphWorkflow:
                     }
                 },
                 "status": "running",
-                "timestamp": datetime.utcnow().isoformat()
+                "timestamp": self.now_iso()
             }
 
             logger.info(f"✅ Dynamic Workflow Built")
@@ -178,13 +261,41 @@ class UnifiedLangGraphWorkflow:
             initial_state["workflow_strategy"] = supervisor_analysis.get("workflow_strategy", "parallel_gates")
             initial_state["required_agents"] = supervisor_analysis.get("required_agents", [])
 
-            # Execute graph with streaming
+            # Execute graph with streaming. Cached graphs share a checkpointer,
+            # so thread ids must be unique across concurrent requests
             config = {
-                "configurable": {"thread_id": f"unified_{datetime.utcnow().timestamp()}"},
-                "recursion_limit": supervisor_analysis["max_iterations"] * 10  # Dynamic limit
+                "configurable": {"thread_id": f"unified_{datetime.utcnow().timestamp()}_{uuid.uuid4().hex[:8]}"},
+                "recursion_limit": self._recursion_limit(workflow_graph, supervisor_analysis["max_iterations"])
             }
 
-            async for event in workflow_graph.astream(initial_state, config):
+            # "custom" carries tokens that nodes emit through LangGraph's stream
+            # writer (get_stream_writer), delivered on this loop as they arrive.
+            # "values" carries the full reduced state after each step; the last
+            # one is the final state, so it isn't read back from the checkpointer
+            final_values = initial_state
+            async for mode, event in workflow_graph.astream(
+                initial_state,
+                config,
+                stream_mode=["updates", "custom", "values"],
+                durability=self.CHECKPOINT_DURABILITY,
+            ):
+                if mode == "values":
+                    final_values = event
+                    continue
+
+                if mode == "custom":
+                    # The writer accepts any payload; bare values (e.g. a
+                    # token string) are wrapped so updates is always a dict
+                    if not isinstance(event, dict):
+                        event = {"type": "token", "content": event}
+                    yield {
+                        "node": event.get("node", "stream"),
+                        "updates": event,
+                        "status": "streaming",
+                        "timestamp": self.now_iso()
+                    }
+                    continue
+
                 for node_name, node_output in event.items():
                     logger.info(f"📍 Node '{node_name}' completed")
 
@@ -193,17 +304,14 @@ class UnifiedLangGraphWorkflow:
                         "node": node_name,
                         "updates": node_output,
                         "status": "running",
-                        "timestamp": datetime.utcnow().isoformat()
+                        "timestamp": self.now_iso()
                     }
 
-            # Get final state
-            final_state = await workflow_graph.aget_state(config)
-
             yield {
                 "node": "END",
-                "updates": final_state.values,
+                "updates": final_values,
                 "status": "completed",
-                "timestamp": datetime.utcnow().isoformat()
+                "timestamp": self.now_iso()
             }
 
             logger.info("✅ Supervisor-Led Workflow Execution Completed")
@@ -214,9 +322,17 @@ class UnifiedLangGraphWorkflow:
                 "node": "ERROR",
                 "updates": {"error": str(e), "traceback": str(e)},
                 "status": "error",
-                "timestamp": datetime.utcnow().isoformat()
+                "timestamp": self.now_iso()
             }
 
+        finally:
+            # Drop this run's checkpoints from the shared checkpointer
+            if workflow_graph is not None and config is not None:
+                try:
+                    await workflow_graph.checkpointer.adelete_thread(config["configurable"]["thread_id"])
+                except Exception as e:
+                    logger.warning(f"Failed to release workflow checkpoints: {e}")
+
 
 # Global unified workflow instance
 unified_workflow = UnifiedLangGraphWorkflow()
@@ -6,12 +6,15 @@ Mirrors the LangChain implementation with:
 - Review loop with FixCodeAgent
 - Configurable max iterations
 """
+import asyncio
+import difflib
 import logging
 import re
-import uuid
+import secrets
 import time
 from datetime import datetime
-from typing import List, Dict, Any, AsyncGenerator, Optional, Literal
+from typing import List, Dict, Any, AsyncGenerator, Optional, Literal, Tuple
+from collections import defaultdict
 from dataclasses import dataclass, field
 from agent_framework import (
     WorkflowBuilder,
@@ -25,6 +28,7 @@ from agent_framework import (
 from app.services.vllm_client import vllm_router
 from app.agent.base.interface import BaseWorkflow, BaseWorkflowManager
 from app.core.config import settings
+from app.tools.performance import ResultCache
 
 logger = logging.getLogger(__name__)
 
@@ -125,17 +129,130 @@ WORKFLOW_TEMPLATES: Dict[TaskType, Dict[str, Any]] = {
     }
 }
 
+# workflow_created edges for each template; templates are static, so the
+# edge dicts are built once and shared by every event (like "nodes")
+TEMPLATE_EDGES: Dict[TaskType, List[Dict[str, Optional[str]]]] = {
+    task_type: [
+        {"from": f[0], "to": f[1], "condition": f[2] if len(f) > 2 else None}
+        for f in template["flow"]
+    ]
+    for task_type, template in WORKFLOW_TEMPLATES.items()
+}
+
+
+# Keyword fallback for _analyze_task, checked in priority order. Matching is
+# by substring, so "fixes" and "errors" count; keywords that contain another
+# keyword in the same entry ("bug_fix", "testing", "documentation") are
+# omitted because they can never change the result
+TASK_TYPE_KEYWORDS: Tuple[Tuple[TaskType, Tuple[str, ...]], ...] = (
+    ("bug_fix", ("fix", "debug", "error")),
+    ("refactoring", ("refactor", "restructure", "clean")),
+    ("test_generation", ("test",)),
+    ("code_review", ("review", "check", "audit")),
+    ("documentation", ("document", "docstring")),
+    ("code_generation", ("create", "implement", "build", "make")),
+)
+
+
+# Patterns used while parsing LLM output, compiled once at import
+_CODE_FENCE_OPEN_RE = re.compile(r'```(\w+)?(?:\s+(\S+))?\n')
+# Rest of a fence header that may still become "<whitespace><filename>\n"
+_PARTIAL_FENCE_FILENAME_RE = re.compile(r'\s+\S*')
+_CODE_BLOCK_RE = re.compile(r'```(\w+)?(?:\s+(\S+))?\n(.*?)```', re.DOTALL)
+_FILENAME_COMMENT_RE = re.compile(r'^(?:#|//|/\*)\s*(?:file(?:name)?:\s*)?(\S+\.\w+)', re.IGNORECASE)
+_CHECKLIST_ITEM_RE = re.compile(r'(?:^|\n)\s*(?:(\d+)[.\)]\s*|[-*]\s*)(.+?)(?=\n|$)')
+_TASK_DEPENDS_RE = re.compile(r'\s*\(depends:\s*([^)]*)\)\s*$', re.IGNORECASE)
+_TASK_ID_RE = re.compile(r'\d+')
+_TASK_TYPE_RE = re.compile(r'task_type:\s*(\w+)')
+
+_REVIEW_ANALYSIS_RE = re.compile(r'ANALYSIS:\s*(.+?)(?=\n\n|ISSUES:|$)', re.IGNORECASE | re.DOTALL)
+_REVIEW_STATUS_RE = re.compile(r'STATUS:\s*(APPROVED|NEEDS_REVISION)', re.IGNORECASE)
+_REVIEW_LGTM_RE = re.compile(r'\b(?:lgtm|looks good|no issues found)\b', re.IGNORECASE)
+_REVIEW_ISSUES_RE = re.compile(r'ISSUES:\s*(.*?)(?=SUGGESTIONS:|STATUS:|```|$)', re.IGNORECASE | re.DOTALL)
+_REVIEW_SUGGESTIONS_RE = re.compile(r'SUGGESTIONS:\s*(.*?)(?=STATUS:|ISSUES:|```|$)', re.IGNORECASE | re.DOTALL)
+_ISSUE_BLOCK_SPLIT_RE = re.compile(r'\n\s*\n|\n(?=-\s*File:)')
+_ISSUE_FILE_RE = re.compile(r'-?\s*File:\s*(.+?)(?:\n|$)', re.IGNORECASE)
+_ISSUE_LINE_RE = re.compile(r'-?\s*Line:\s*(.+?)(?:\n|$)', re.IGNORECASE)
+_ISSUE_SEVERITY_RE = re.compile(r'-?\s*Severity:\s*(.+?)(?:\n|$)', re.IGNORECASE)
+_ISSUE_TEXT_RE = re.compile(r'-?\s*Issue:\s*(.+?)(?:\n-|$)', re.IGNORECASE | re.DOTALL)
+_ISSUE_FIX_RE = re.compile(r'-?\s*Fix:\s*(.+?)(?:\n\n|$)', re.IGNORECASE | re.DOTALL)
+# (key, lower-cased label, pattern) for each field of a structured issue block
+_ISSUE_FIELDS = (
+    ("file", "file:", _ISSUE_FILE_RE),
+    ("line", "line:", _ISSUE_LINE_RE),
+    ("severity", "severity:", _ISSUE_SEVERITY_RE),
+    ("issue", "issue:", _ISSUE_TEXT_RE),
+    ("fix", "fix:", _ISSUE_FIX_RE),
+)
+_SIMPLE_ISSUE_RE = re.compile(r'[-*]\s*(?:Issue:\s*)?(.+)', re.IGNORECASE)
+_SUGGESTION_ITEM_RE = re.compile(r'[-*]\s*(?:Suggest(?:ion)?:\s*)?(.+?)(?=\n[-*]|\n\n|$)', re.IGNORECASE)
+
+# Code fence language -> file extension for generated filenames
+_LANG_EXT = {
+    "python": "py", "javascript": "js", "typescript": "ts",
+    "java": "java", "go": "go", "rust": "rs", "cpp": "cpp",
+    "c": "c", "html": "html", "css": "css", "json": "json",
+    "yaml": "yaml", "sql": "sql", "bash": "sh", "shell": "sh"
+}
+
+# User prompt prefixes for the review and fix agents
+_REVIEW_PREFIX = "Review this code:\n\n"
+_FIX_PREFIX = "Fix this code:\n\n"
+# A diff only shows fragments, so corrected code is left to FixCodeAgent
+_REVIEW_DIFF_PREFIX = (
+    "Review the changes made to previously reviewed code. "
+    "Unchanged regions were already reviewed. Report issues only; "
+    "do not provide corrected code.\n\n"
+)
+
+
+def _unique_filename(
+    filename: str,
+    used_filenames: set,
+    name_next_suffix: Dict[tuple, int],
+) -> str:
+    """Claim filename, or the first free name_N.ext variant, in used_filenames.
+
+    name_next_suffix remembers where the last search for each (name, ext)
+    stopped. Names below it are already taken, so repeated duplicates do
+    not re-probe every earlier suffix.
+    """
+    if filename in used_filenames:
+        name, ext = filename.rsplit('.', 1) if '.' in filename else (filename, 'txt')
+        key = (name, ext)
+        suffix = name_next_suffix[key]
+        while f"{name}_{suffix}.{ext}" in used_filenames:
+            suffix += 1
+        name_next_suffix[key] = suffix + 1
+        filename = f"{name}_{suffix}.{ext}"
+    used_filenames.add(filename)
+    return filename
+
 
 class CodeBlockParser:
-    """Parser for detecting and extracting code blocks from streaming text."""
+    """Parser for detecting and extracting code blocks from streaming text.
+
+    Fences follow _CODE_BLOCK_RE: a block opens at a ```lang header line and
+    closes at the next ```, wherever it is. Scanning is incremental: scan_pos
+    marks where the next fence search starts, so text that can no longer
+    begin a fence is not searched again on every chunk.
+    """
+
+    # Buffer bounds for runaway output that never completes a fence
+    MAX_PROSE_BUFFER = 1 << 20  # Unresolved text outside a code block
+    MAX_CODE_BLOCK = 4 << 20  # A longer code block is dropped up to its closing fence
+    PROSE_TAIL = 256  # Kept on prose compaction so a partial fence header survives
 
     def __init__(self):
         self.buffer = ""
+        self.scan_pos = 0  # Fence searches start here; earlier text cannot match
         self.in_code_block = False
+        self.dropping_block = False  # Inside a code block dropped for size
         self.current_language = ""
         self.current_filename = ""
         self.used_filenames = set()  # Track used filenames for uniqueness
         self.file_counter = {}  # Track counter per extension
+        self.name_next_suffix = defaultdict(lambda: 1)  # (name, ext) -> next suffix to try
 
     def add_chunk(self, chunk: str) -> List[Dict[str, Any]]:
         self.buffer += chunk
@@ -143,31 +260,57 @@ class CodeBlockParser:
 
         while True:
             if not self.in_code_block:
-                match = re.search(r'```(\w+)?(?:\s+(\S+))?\n', self.buffer)
+                match = _CODE_FENCE_OPEN_RE.search(self.buffer, self.scan_pos)
+                if match and match.group(2) is None and _PARTIAL_FENCE_FILENAME_RE.fullmatch(
+                    self.buffer, match.end(1) if match.group(1) else match.start() + 3
+                ):
+                    # Like _CODE_BLOCK_RE, a single-token line after the header
+                    # is taken as the filename; wait until that line is complete
+                    self.buffer = self.buffer[match.start():]
+                    self.scan_pos = 0
+                    break
                 if match:
                     self.in_code_block = True
                     self.current_language = match.group(1) or "text"
                     self.current_filename = match.group(2) or ""  # Will generate later
                     self.buffer = self.buffer[match.end():]
+                    self.scan_pos = 0
                 else:
+                    # An opening fence can only start at a ``` that may still
+                    # complete (or in the last two chars); prose before that
+                    # is never used, so drop it
+                    fence_pos = self.buffer.find('```', self.scan_pos)
+                    if fence_pos == -1:
+                        fence_pos = max(0, len(self.buffer) - 2)
+                    self.buffer = self.buffer[fence_pos:]
+                    self.scan_pos = 0
                     break
             else:
-                end_match = re.search(r'\n```(?:\s|$)', self.buffer)
-                if end_match:
-                    code_content = self.buffer[:end_match.start()].strip()
+                end_pos = self.buffer.find('```', self.scan_pos)
+                if end_pos != -1 and self.dropping_block:
+                    # End of the dropped block; what follows is prose again
+                    self.buffer = self.buffer[end_pos + 3:]
+                    self.scan_pos = 0
+                    self.in_code_block = False
+                    self.dropping_block = False
+                    self.current_language = ""
+                    self.current_filename = ""
+                elif end_pos != -1:
+                    code_content = self.buffer[:end_pos].strip()
 
                     # Generate unique filename if not provided
                     filename = self.current_filename
                     if not filename:
                         # Try to extract from first comment line
-                        first_line = code_content.split('\n')[0] if code_content else ""
-                        comment_match = re.match(r'^(?:#|//|/\*)\s*(?:file(?:name)?:\s*)?(\S+\.\w+)', first_line, re.IGNORECASE)
+                        first_line = code_content.partition('\n')[0]
+                        comment_match = _FILENAME_COMMENT_RE.match(first_line)
                         if comment_match:
                             filename = comment_match.group(1)
                         else:
                             # Generate unique name
-                            ext = self._get_extension(self.current_language)
-                            base_name = f"code_{self.current_language.lower()}" if self.current_language != "text" else "code"
+                            lang_lower = self.current_language.lower()
+                            ext = _LANG_EXT.get(lang_lower, "txt")
+                            base_name = f"code_{lang_lower}" if self.current_language != "text" else "code"
                             if ext not in self.file_counter:
                                 self.file_counter[ext] = 0
                             self.file_counter[ext] += 1
@@ -177,13 +320,7 @@ class CodeBlockParser:
                                 filename = f"{base_name}_{self.file_counter[ext]}.{ext}"
 
                     # Ensure uniqueness
-                    original_filename = filename
-                    counter = 1
-                    while filename in self.used_filenames:
-                        name, ext = original_filename.rsplit('.', 1) if '.' in original_filename else (original_filename, 'txt')
-                        filename = f"{name}_{counter}.{ext}"
-                        counter += 1
-                    self.used_filenames.add(filename)
+                    filename = _unique_filename(filename, self.used_filenames, self.name_next_suffix)
 
                     artifacts.append({
                         "type": "artifact",
@@ -191,37 +328,56 @@ class CodeBlockParser:
                         "filename": filename,
                         "content": code_content
                     })
-                    self.buffer = self.buffer[end_match.end():]
+                    self.buffer = self.buffer[end_pos + 3:]
+                    self.scan_pos = 0
                     self.in_code_block = False
                     self.current_language = ""
                     self.current_filename = ""
                 else:
+                    # No ``` so far; only one split across chunks can still match
+                    if self.dropping_block:
+                        self.buffer = self.buffer[-2:]
+                    self.scan_pos = max(0, len(self.buffer) - 2)
                     break
 
+        if self.in_code_block and len(self.buffer) > self.MAX_CODE_BLOCK:
+            logger.warning(f"Dropping oversized {self.current_language} code block ({len(self.buffer)} chars so far)")
+            # Stay in the block so its closing fence is not taken for an
+            # opening one; keep two chars in case that fence is split
+            self.buffer = self.buffer[-2:]
+            self.scan_pos = 0
+            self.dropping_block = True
+        elif not self.in_code_block and len(self.buffer) > self.MAX_PROSE_BUFFER:
+            self.buffer = self.buffer[-self.PROSE_TAIL:]
+            self.scan_pos = 0
+
         return artifacts
 
     def _get_extension(self, language: str) -> str:
-        extensions = {
-            "python": "py", "javascript": "js", "typescript": "ts",
-            "java": "java", "go": "go", "rust": "rs", "cpp": "cpp",
-            "c": "c", "html": "html", "css": "css", "json": "json",
-            "yaml": "yaml", "sql": "sql", "bash": "sh", "shell": "sh"
-        }
-        return extensions.get(language.lower(), "txt")
+        return _LANG_EXT.get(language.lower(), "txt")
 
 
 def parse_checklist(text: str) -> List[Dict[str, Any]]:
-    """Parse text into checklist items."""
+    """Parse text into checklist items.
+
+    A trailing "(depends: 1, 3)" or "(depends: none)" note is moved from the
+    task text into depends_on; items without one get depends_on=None.
+    """
     items = []
-    pattern = r'(?:^|\n)\s*(?:(\d+)[.\)]\s*|[-*]\s*)(.+?)(?=\n|$)'
-    matches = re.findall(pattern, text)
+    matches = _CHECKLIST_ITEM_RE.findall(text)
 
     for i, (num, task) in enumerate(matches, 1):
         task = task.strip()
+        depends_on = None
+        depends_match = _TASK_DEPENDS_RE.search(task)
+        if depends_match:
+            task = task[:depends_match.start()]
+            depends_on = [int(task_id) for task_id in _TASK_ID_RE.findall(depends_match.group(1))]
         if task:
             items.append({
                 "id": int(num) if num else i,
                 "task": task,
+                "depends_on": depends_on,
                 "completed": False,
                 "artifacts": []
             })
@@ -229,39 +385,62 @@ def parse_checklist(text: str) -> List[Dict[str, Any]]:
     return items
 
 
+def plan_task_waves(checklist: List[Dict[str, Any]]) -> List[List[int]]:
+    """Group checklist indexes into waves whose tasks can run concurrently.
+
+    A task goes in the wave after the last one holding a task it depends on.
+    depends_on=None means it depends on every earlier task, so a plan without
+    dependency notes runs one task per wave, in order. Only earlier tasks
+    count as dependencies; other ids are ignored.
+    """
+    index_by_id = {}
+    levels: List[int] = []
+    for idx, item in enumerate(checklist):
+        if item.get("depends_on") is None:
+            level = max(levels, default=-1) + 1
+        else:
+            level = max(
+                (levels[index_by_id[task_id]] for task_id in item["depends_on"] if task_id in index_by_id),
+                default=-1
+            ) + 1
+        levels.append(level)
+        index_by_id.setdefault(item["id"], idx)
+
+    waves: List[List[int]] = [[] for _ in range(max(levels, default=-1) + 1)]
+    for idx, level in enumerate(levels):
+        waves[level].append(idx)
+    return waves
+
+
 def parse_code_blocks(text: str) -> List[Dict[str, Any]]:
     """Extract code blocks from text with unique filename generation."""
     artifacts = []
-    pattern = r'```(\w+)?(?:\s+(\S+))?\n(.*?)```'
-    matches = re.findall(pattern, text, re.DOTALL)
-
-    extensions = {
-        "python": "py", "javascript": "js", "typescript": "ts",
-        "java": "java", "go": "go", "rust": "rs", "cpp": "cpp",
-        "c": "c", "html": "html", "css": "css", "json": "json",
-        "yaml": "yaml", "sql": "sql", "bash": "sh", "shell": "sh"
-    }
 
     # Track used filenames to generate unique names
     used_filenames = set()
+    name_next_suffix = defaultdict(lambda: 1)
     file_counter = {}  # Track counter per extension
 
-    for lang, filename, content in matches:
+    # finditer avoids materializing every block's groups up front; groups("")
+    # keeps findall's empty-string default for unmatched lang/filename
+    for match in _CODE_BLOCK_RE.finditer(text):
+        lang, filename, content = match.groups("")
         lang = lang or "text"
         content = content.strip()
 
         # Try to extract filename from first comment line if not provided
         if not filename and content:
-            first_line = content.split('\n')[0] if content else ""
+            first_line = content.partition('\n')[0]
             # Match patterns like: # filename.py, // filename.js, /* filename.css */
-            comment_match = re.match(r'^(?:#|//|/\*)\s*(?:file(?:name)?:\s*)?(\S+\.\w+)', first_line, re.IGNORECASE)
+            comment_match = _FILENAME_COMMENT_RE.match(first_line)
             if comment_match:
                 filename = comment_match.group(1)
 
         # Generate unique filename if still not provided
         if not filename:
-            ext = extensions.get(lang.lower(), "txt")
-            base_name = f"code_{lang.lower()}" if lang != "text" else "code"
+            lang_lower = lang.lower()
+            ext = _LANG_EXT.get(lang_lower, "txt")
+            base_name = f"code_{lang_lower}" if lang != "text" else "code"
 
             # Initialize counter for this extension
             if ext not in file_counter:
@@ -275,14 +454,7 @@ def parse_code_blocks(text: str) -> List[Dict[str, Any]]:
                 filename = f"{base_name}_{file_counter[ext]}.{ext}"
 
         # Ensure filename is unique even if explicitly provided
-        original_filename = filename
-        counter = 1
-        while filename in used_filenames:
-            name, ext = original_filename.rsplit('.', 1) if '.' in original_filename else (original_filename, 'txt')
-            filename = f"{name}_{counter}.{ext}"
-            counter += 1
-
-        used_filenames.add(filename)
+        filename = _unique_filename(filename, used_filenames, name_next_suffix)
 
         artifacts.append({
             "type": "artifact",
@@ -294,6 +466,34 @@ def parse_code_blocks(text: str) -> List[Dict[str, Any]]:
     return artifacts
 
 
+def _parse_issue_fields(block: str) -> Dict[str, str]:
+    """Extract the File/Line/Severity/Issue/Fix fields of one issue block.
+
+    Each field pattern is anchored at its label, which is located with
+    str.find on the lower-cased block. An unanchored search of a pattern
+    starting with -?\\s* is retried at every offset, so this takes about half
+    the time. Non-ASCII blocks fall back to searching, because lower() can
+    change their length and IGNORECASE folds some non-ASCII letters.
+    """
+    fields = {}
+    lower = block.lower() if block.isascii() else None
+    for key, label, pattern in _ISSUE_FIELDS:
+        if lower is None:
+            match = pattern.search(block)
+        else:
+            match = None
+            pos = lower.find(label)
+            while pos != -1 and not match:
+                match = pattern.match(block, pos)
+                pos = lower.find(label, pos + 1)
+        if match:
+            fields[key] = match.group(1).strip()
+
+    if "severity" in fields:
+        fields["severity"] = fields["severity"].lower()
+    return fields
+
+
 def parse_review(text: str) -> Dict[str, Any]:
     """Parse review text into structured format with line-specific issues."""
     issues = []
@@ -302,56 +502,40 @@ def parse_review(text: str) -> Dict[str, Any]:
     analysis = ""
 
     # Parse ANALYSIS
-    analysis_match = re.search(r'ANALYSIS:\s*(.+?)(?=\n\n|ISSUES:|$)', text, re.IGNORECASE | re.DOTALL)
+    analysis_match = _REVIEW_ANALYSIS_RE.search(text)
     if analysis_match:
         analysis = analysis_match.group(1).strip()
 
     # Parse STATUS
-    status_match = re.search(r'STATUS:\s*(APPROVED|NEEDS_REVISION)', text, re.IGNORECASE)
+    status_match = _REVIEW_STATUS_RE.search(text)
     if status_match:
         approved = status_match.group(1).upper() == "APPROVED"
-    elif re.search(r'\b(?:lgtm|looks good|no issues found)\b', text, re.IGNORECASE):
+    elif _REVIEW_LGTM_RE.search(text):
         approved = True
 
     # Parse ISSUES section
-    issues_section = re.search(r'ISSUES:\s*(.*?)(?=SUGGESTIONS:|STATUS:|```|$)', text, re.IGNORECASE | re.DOTALL)
+    issues_section = _REVIEW_ISSUES_RE.search(text)
     if issues_section:
         issues_text = issues_section.group(1).strip()
-        issue_blocks = re.split(r'\n\s*\n|\n(?=-\s*File:)', issues_text)
+        issue_blocks = _ISSUE_BLOCK_SPLIT_RE.split(issues_text)
         for block in issue_blocks:
             if not block.strip():
                 continue
 
-            issue_obj = {}
-            file_match = re.search(r'-?\s*File:\s*(.+?)(?:\n|$)', block, re.IGNORECASE)
-            line_match = re.search(r'-?\s*Line:\s*(.+?)(?:\n|$)', block, re.IGNORECASE)
-            severity_match = re.search(r'-?\s*Severity:\s*(.+?)(?:\n|$)', block, re.IGNORECASE)
-            issue_match = re.search(r'-?\s*Issue:\s*(.+?)(?:\n-|$)', block, re.IGNORECASE | re.DOTALL)
-            fix_match = re.search(r'-?\s*Fix:\s*(.+?)(?:\n\n|$)', block, re.IGNORECASE | re.DOTALL)
-
-            if file_match:
-                issue_obj["file"] = file_match.group(1).strip()
-            if line_match:
-                issue_obj["line"] = line_match.group(1).strip()
-            if severity_match:
-                issue_obj["severity"] = severity_match.group(1).strip().lower()
-            if issue_match:
-                issue_obj["issue"] = issue_match.group(1).strip()
-            if fix_match:
-                issue_obj["fix"] = fix_match.group(1).strip()
+            issue_obj = _parse_issue_fields(block)
 
             if issue_obj.get("issue"):
                 issues.append(issue_obj)
             elif block.strip():
-                simple_match = re.search(r'[-*]\s*(?:Issue:\s*)?(.+)', block, re.IGNORECASE)
+                simple_match = _SIMPLE_ISSUE_RE.search(block)
                 if simple_match:
                     issues.append({"issue": simple_match.group(1).strip(), "severity": "warning"})
 
     # Parse SUGGESTIONS section
-    suggestions_section = re.search(r'SUGGESTIONS:\s*(.*?)(?=STATUS:|ISSUES:|```|$)', text, re.IGNORECASE | re.DOTALL)
+    suggestions_section = _REVIEW_SUGGESTIONS_RE.search(text)
     if suggestions_section:
         suggestions_text = suggestions_section.group(1).strip()
-        for match in re.finditer(r'[-*]\s*(?:Suggest(?:ion)?:\s*)?(.+?)(?=\n[-*]|\n\n|$)', suggestions_text, re.IGNORECASE):
+        for match in _SUGGESTION_ITEM_RE.finditer(suggestions_text):
             suggestions.append({"suggestion": match.group(1).strip()})
 
     # Check severity for approval override
@@ -371,10 +555,26 @@ def parse_review(text: str) -> Dict[str, Any]:
     }
 
 
-@dataclass
+def _format_issue(issue: Any) -> str:
+    """Format a parsed review issue for the FixCodeAgent prompt."""
+    if isinstance(issue, dict):
+        parts = []
+        if issue.get("file"):
+            parts.append(f"File: {issue['file']}")
+        if issue.get("line"):
+            parts.append(f"Line: {issue['line']}")
+        if issue.get("issue"):
+            parts.append(f"Issue: {issue['issue']}")
+        if issue.get("fix"):
+            parts.append(f"Fix: {issue['fix']}")
+        return "\n  ".join(parts)
+    return str(issue)
+
+
+@dataclass(slots=True)
 class Response:
     """Complete response wrapper."""
-    messages: List[ChatMessage] = field(default_factory=list)
+    messages: List[ChatMessage] = field(default_factory=list, repr=False)
     conversation_id: Optional[str] = None
     response_id: Optional[str] = None
     object: str = "response"
@@ -385,7 +585,7 @@ class Response:
 
     def __post_init__(self):
         if self.response_id is None:
-            self.response_id = f"resp_{uuid.uuid4().hex[:24]}"
+            self.response_id = f"resp_{secrets.token_hex(12)}"
         if self.created_at is None:
             self.created_at = datetime.now()
 
@@ -401,14 +601,17 @@ class VLLMChatClient(BaseChatClient):
         self.vllm_client = vllm_router.get_client(model_type)
         self.model_type = model_type
 
-    async def _inner_get_response(self, messages: List[ChatMessage], **kwargs) -> Response:
-        vllm_messages = [
+    @staticmethod
+    def _to_vllm_messages(messages: List[ChatMessage]) -> List[Dict[str, str]]:
+        """Convert agent messages to OpenAI-style role/content dicts."""
+        return [
             {"role": msg.role if isinstance(msg.role, str) else msg.role.value, "content": msg.text}
             for msg in messages
         ]
 
+    async def _inner_get_response(self, messages: List[ChatMessage], **kwargs) -> Response:
         vllm_response = await self.vllm_client.chat_completion(
-            messages=vllm_messages,
+            messages=self._to_vllm_messages(messages),
             temperature=kwargs.get("temperature", 0.7),
             max_tokens=kwargs.get("max_tokens", 4096),
             stream=False
@@ -418,27 +621,77 @@ class VLLMChatClient(BaseChatClient):
         return Response(messages=[response_message], model=self.model_type)
 
     async def _inner_get_streaming_response(self, messages: List[ChatMessage], **kwargs) -> AsyncGenerator[ChatResponseUpdate, None]:
-        vllm_messages = [
-            {"role": msg.role if isinstance(msg.role, str) else msg.role.value, "content": msg.text}
-            for msg in messages
-        ]
-
         async for chunk in self.vllm_client.stream_chat_completion(
-            messages=vllm_messages,
+            messages=self._to_vllm_messages(messages),
             temperature=kwargs.get("temperature", 0.7),
             max_tokens=kwargs.get("max_tokens", 4096)
         ):
             yield ChatResponseUpdate(contents=[TextContent(text=chunk)], role="assistant", author_name=self.model_type)
 
 
+def _extract_text(update: ChatResponseUpdate) -> str:
+    """Return the text carried by a streamed agent update."""
+    contents = update.contents
+    # Token streaming almost always sends one content item per update
+    if len(contents) == 1:
+        content = contents[0]
+        return content.text if isinstance(content, TextContent) and content.text else ""
+    return "".join(c.text for c in contents if isinstance(c, TextContent) and c.text)
+
+
+def _tail_lines(chunks: List[str], count: int) -> str:
+    """Return the last count lines of the text streamed so far in chunks.
+
+    Only the trailing chunks that hold those lines are joined.
+    """
+    start = len(chunks)
+    newlines = 0
+    while start and newlines < count:
+        start -= 1
+        newlines += chunks[start].count("\n")
+    return "\n".join("".join(chunks[start:]).rsplit("\n", count)[-count:])
+
+
+# Supervisor responses by (model, prompt). The analysis only classifies the
+# request, so a repeated request can skip the LLM round-trip
+SUPERVISOR_CACHE_SIZE = 256
+_supervisor_cache = ResultCache(
+    max_size=SUPERVISOR_CACHE_SIZE,
+    ttl_seconds=settings.supervisor_cache_ttl_seconds,
+    enabled=settings.supervisor_cache_ttl_seconds > 0
+)
+
+
 class DynamicCodingWorkflow(BaseWorkflow):
     """Dynamic multi-agent coding workflow with SupervisorAgent."""
 
+    # Task types with a dedicated workflow; all others run the coding workflow
+    WORKFLOW_HANDLERS = {
+        "test_generation": "_execute_test_workflow",
+        "code_review": "_execute_review_only_workflow",
+    }
+
+    # Task types whose workflow never runs the PlanningAgent
+    NO_PLANNING_TASK_TYPES = frozenset({"code_review"})
+
+    # Re-reviews send a diff only while it stays below this fraction of the code
+    REVIEW_DIFF_MAX_RATIO = 0.6
+
+    # Review/fix output previews: minimum seconds between updates, lines shown
+    STREAM_PREVIEW_INTERVAL = 0.2
+    STREAM_PREVIEW_LINES = 10
+
     def __init__(self):
         """Initialize the dynamic workflow."""
         self.reasoning_client = VLLMChatClient("reasoning")
         self.coding_client = VLLMChatClient("coding")
 
+        # Planning tasks started alongside the supervisor, by workflow_id
+        self._speculative_plans: Dict[str, asyncio.Task] = {}
+
+        # ReviewAgent has a fixed system prompt, so one instance serves every review
+        self._review_agent: Optional[ChatAgent] = None
+
         # Agent prompts
         self.prompts = {
             "SupervisorAgent": """You are a Supervisor Agent that analyzes user requests and determines the best workflow.
@@ -472,7 +725,9 @@ Be concise. Focus on accurate classification.""",
 Rules:
 - One task per line
 - Clear, actionable steps
-- No explanations, only the numbered list""",
+- No explanations, only the numbered list
+- End a task with (depends: none) if it needs no code from earlier tasks, or
+  (depends: 1, 3) if it only needs those; tasks without a note get all earlier code""",
 
             "CodingAgent": """Implement the specified task.
 
@@ -507,27 +762,29 @@ SUGGESTIONS:
 
 STATUS: [APPROVED or NEEDS_REVISION]
 
-If NEEDS_REVISION, provide corrected code:
+If NEEDS_REVISION on a full code review, provide corrected code:
 ```language filename.ext
 // corrected complete code
 ```
 </response_format>""",
 
+            # Static instructions come before {issues} so every fix request
+            # shares a byte-identical prefix for vLLM prefix caching
             "FixCodeAgent": """Fix the code based on review feedback.
 
-<review_issues>
-{issues}
-</review_issues>
-
 <rules>
-- Address ALL issues listed above
+- Address ALL issues listed in <review_issues>
 - Provide complete corrected code
 - Use same filename format
 </rules>
 
 ```language filename.ext
 // corrected code
-```"""
+```
+
+<review_issues>
+{issues}
+</review_issues>"""
         }
 
         logger.info("DynamicCodingWorkflow (Microsoft) initialized")
@@ -537,25 +794,16 @@ If NEEDS_REVISION, provide corrected code:
         text_lower = supervisor_response.lower()
 
         # Look for explicit TASK_TYPE
-        task_match = re.search(r'task_type:\s*(\w+)', text_lower)
+        task_match = _TASK_TYPE_RE.search(text_lower)
         if task_match:
             task_type = task_match.group(1).replace(' ', '_')
             if task_type in WORKFLOW_TEMPLATES:
                 return task_type
 
         # Fallback detection
-        if any(kw in text_lower for kw in ["bug_fix", "fix", "debug", "error"]):
-            return "bug_fix"
-        elif any(kw in text_lower for kw in ["refactor", "restructure", "clean"]):
-            return "refactoring"
-        elif any(kw in text_lower for kw in ["test", "testing", "unit test"]):
-            return "test_generation"
-        elif any(kw in text_lower for kw in ["review", "check", "audit"]):
-            return "code_review"
-        elif any(kw in text_lower for kw in ["document", "documentation", "docstring"]):
-            return "documentation"
-        elif any(kw in text_lower for kw in ["create", "implement", "build", "make"]):
-            return "code_generation"
+        for task_type, keywords in TASK_TYPE_KEYWORDS:
+            if any(kw in text_lower for kw in keywords):
+                return task_type
 
         return "general"
 
@@ -572,13 +820,15 @@ If NEEDS_REVISION, provide corrected code:
         """Execute the workflow with streaming updates."""
         logger.info(f"Streaming dynamic workflow for: {user_request[:100]}...")
 
-        workflow_id = f"wf-{uuid.uuid4().hex[:8]}"
+        workflow_id = f"wf-{secrets.token_hex(4)}"
         max_iterations = settings.max_review_iterations
 
-        def extract_text(update: ChatResponseUpdate) -> str:
-            return "".join(c.text for c in update.contents if isinstance(c, TextContent) and c.text)
-
         try:
+            # Planning depends only on the request, so run it while the
+            # supervisor classifies; it is discarded for review-only tasks
+            if settings.enable_parallel_coding:
+                self._speculative_plans[workflow_id] = asyncio.create_task(self._run_planning(user_request))
+
             # Phase 1: Supervisor Agent analyzes task
             yield {
                 "agent": "SupervisorAgent",
@@ -586,7 +836,7 @@ If NEEDS_REVISION, provide corrected code:
                 "status": "running",
                 "message": "Analyzing task...",
                 "agent_spawn": {
-                    "agent_id": f"supervisor-{uuid.uuid4().hex[:6]}",
+                    "agent_id": f"supervisor-{secrets.token_hex(3)}",
                     "agent_type": "SupervisorAgent",
                     "parent_agent": "Orchestrator",
                     "spawn_reason": "Analyze task and determine workflow",
@@ -594,28 +844,40 @@ If NEEDS_REVISION, provide corrected code:
                 }
             }
 
-            supervisor_agent = ChatAgent(
-                name="SupervisorAgent",
-                description="Analyzes tasks and determines workflow",
-                chat_client=self.reasoning_client,
-                system_message=self.prompts["SupervisorAgent"]
-            )
+            supervisor_prompt = f"Analyze this request:\n\n{user_request}"
+            cache_params = {"model": settings.reasoning_model, "prompt": supervisor_prompt}
+            cached = _supervisor_cache.get("SupervisorAgent", cache_params)
+            if cached is not None:
+                # Like lm_cache hits, a cached response took no model time
+                supervisor_text, supervisor_latency = cached, 0
+            else:
+                supervisor_agent = ChatAgent(
+                    name="SupervisorAgent",
+                    description="Analyzes tasks and determines workflow",
+                    chat_client=self.reasoning_client,
+                    system_message=self.prompts["SupervisorAgent"]
+                )
 
-            supervisor_msg = ChatMessage(role="user", text=f"Analyze this request:\n\n{user_request}")
-            supervisor_text = ""
-            start_time = time.time()
-            async for update in supervisor_agent.run_stream(supervisor_msg):
-                supervisor_text += extract_text(update)
-            supervisor_latency = int((time.time() - start_time) * 1000)
+                supervisor_msg = ChatMessage(role="user", text=supervisor_prompt)
+                supervisor_chunks: List[str] = []
+                start_time = time.time()
+                async for update in supervisor_agent.run_stream(supervisor_msg):
+                    supervisor_chunks.append(_extract_text(update))
+                supervisor_text = "".join(supervisor_chunks)
+                supervisor_latency = int((time.time() - start_time) * 1000)
+                _supervisor_cache.set("SupervisorAgent", cache_params, supervisor_text)
 
             task_type = self._analyze_task(supervisor_text)
             template = WORKFLOW_TEMPLATES[task_type]
+            if task_type in self.NO_PLANNING_TASK_TYPES:
+                self._discard_speculative_plan(workflow_id)
 
             yield {
                 "agent": "SupervisorAgent",
                 "type": "completed",
                 "status": "completed",
                 "message": f"Task type: {task_type}",
+                "cached": cached is not None,
                 "task_analysis": {
                     "task_type": task_type,
                     "workflow_name": template["name"],
@@ -624,7 +886,7 @@ If NEEDS_REVISION, provide corrected code:
                 },
                 "prompt_info": {
                     "system_prompt": self.prompts["SupervisorAgent"],
-                    "user_prompt": f"Analyze this request:\n\n{user_request}",
+                    "user_prompt": supervisor_prompt,
                     "output": supervisor_text,
                     "model": settings.reasoning_model,
                     "latency_ms": supervisor_latency
@@ -642,45 +904,135 @@ If NEEDS_REVISION, provide corrected code:
                     "workflow_type": template["name"],
                     "task_type": task_type,
                     "nodes": template["nodes"],
-                    "edges": [{"from": f[0], "to": f[1], "condition": f[2] if len(f) > 2 else None} for f in template["flow"]],
+                    "edges": TEMPLATE_EDGES[task_type],
                     "max_iterations": max_iterations if template["has_review_loop"] else 0,
                     "dynamically_created": True
                 }
             }
 
             # Phase 3: Execute workflow based on task type
-            if task_type in ["code_generation", "bug_fix", "refactoring", "general"]:
-                async for update in self._execute_coding_workflow(user_request, task_type, template, workflow_id, max_iterations):
-                    yield update
-            elif task_type == "test_generation":
-                async for update in self._execute_test_workflow(user_request, task_type, template, workflow_id):
-                    yield update
-            elif task_type == "code_review":
-                async for update in self._execute_review_only_workflow(user_request, task_type, template, workflow_id):
-                    yield update
+            handler_name = self.WORKFLOW_HANDLERS.get(task_type)
+            if handler_name is None:
+                updates = self._execute_coding_workflow(user_request, task_type, template, workflow_id, max_iterations)
             else:
-                async for update in self._execute_coding_workflow(user_request, task_type, template, workflow_id, max_iterations):
-                    yield update
+                updates = getattr(self, handler_name)(user_request, task_type, template, workflow_id)
+            async for update in updates:
+                yield update
 
         except Exception as e:
             logger.error(f"Error in dynamic workflow: {e}")
             yield {"agent": "Workflow", "type": "error", "status": "error", "message": str(e)}
             raise
+        finally:
+            self._discard_speculative_plan(workflow_id)
+
+    def _discard_speculative_plan(self, workflow_id: str) -> None:
+        """Cancel a speculative planning task that will not be used."""
+        planning = self._speculative_plans.pop(workflow_id, None)
+        if planning is None:
+            return
+        if planning.done():
+            if not planning.cancelled():
+                planning.exception()  # Mark a failure as retrieved; nobody awaits it
+        else:
+            planning.cancel()
+
+    def _review_prompt(self, code_text: str, reviewed_code: Optional[str]) -> str:
+        """Build the ReviewAgent prompt, sending only changes on re-review.
+
+        After a fix, most of the code was already reviewed, so a unified diff
+        against the previous review is sent instead, unless it is larger
+        than REVIEW_DIFF_MAX_RATIO of the full code.
+        """
+        if reviewed_code is not None:
+            diff = "".join(difflib.unified_diff(
+                reviewed_code.splitlines(keepends=True),
+                code_text.splitlines(keepends=True),
+                fromfile="reviewed",
+                tofile="current"
+            ))
+            if diff and len(diff) <= self.REVIEW_DIFF_MAX_RATIO * len(code_text):
+                return f"{_REVIEW_DIFF_PREFIX}```diff\n{diff.rstrip()}\n```"
+        return _REVIEW_PREFIX + code_text
+
+    def _get_review_agent(self) -> ChatAgent:
+        """Get the ReviewAgent, creating it on first use."""
+        if self._review_agent is None:
+            self._review_agent = ChatAgent(
+                name="ReviewAgent",
+                description="Reviews code",
+                chat_client=self.coding_client,
+                system_message=self.prompts["ReviewAgent"]
+            )
+        return self._review_agent
 
-    async def _execute_coding_workflow(
+    async def _stream_agent_cached(
         self,
-        user_request: str,
-        task_type: TaskType,
-        template: Dict[str, Any],
-        workflow_id: str,
-        max_iterations: int
+        agent_name: str,
+        agent: ChatAgent,
+        system_prompt: str,
+        user_prompt: str,
+        result: Dict[str, Any],
+        semantic: bool = False
     ) -> AsyncGenerator[Dict[str, Any], None]:
-        """Execute the main coding workflow with review loop."""
+        """Run a coding-model agent, yielding throttled output previews.
+
+        While the agent streams, a "streaming" update with the last lines of
+        output is yielded at most every STREAM_PREVIEW_INTERVAL seconds.
+        When settings.enable_semantic_cache is set, repeated prompts are
+        served from lm_cache instead; its blocking I/O runs in a thread.
+        Near-identical prompts (settings.semantic_cache_threshold) only
+        match when semantic is set, since a response that rewrites code
+        must come from exactly that code. Only user_prompt is compared for
+        similarity; system_prompt must match exactly.
+
+        result is filled with "text", "latency_ms", "cached" and "similar",
+        which marks a hit on a near-identical rather than the same prompt.
+        """
+        if settings.enable_semantic_cache:
+            from app.services.lm_cache import lm_cache
+
+            cached = await asyncio.to_thread(lm_cache.get, user_prompt, settings.coding_model, context=system_prompt)
+            similar = False
+            if cached is None and semantic:
+                cached = await asyncio.to_thread(
+                    lm_cache.get_similar, user_prompt, settings.coding_model, settings.semantic_cache_threshold,
+                    context=system_prompt
+                )
+                similar = cached is not None
+            if cached is not None:
+                result.update(text=cached, latency_ms=0, cached=True, similar=similar)
+                return
+
+        chunks: List[str] = []
+        length = 0
+        start_time = last_preview = time.time()
+        async for update in agent.run_stream(ChatMessage(role="user", text=user_prompt)):
+            text = _extract_text(update)
+            chunks.append(text)
+            length += len(text)
+            now = time.time()
+            if now - last_preview >= self.STREAM_PREVIEW_INTERVAL:
+                last_preview = now
+                yield {
+                    "agent": agent_name,
+                    "type": "streaming",
+                    "status": "running",
+                    "message": f"Generating... ({length:,} chars)",
+                    "streaming_content": _tail_lines(chunks, self.STREAM_PREVIEW_LINES)
+                }
+        full_text = "".join(chunks)
+        result.update(text=full_text, latency_ms=int((time.time() - start_time) * 1000), cached=False, similar=False)
 
-        def extract_text(update: ChatResponseUpdate) -> str:
-            return "".join(c.text for c in update.contents if isinstance(c, TextContent) and c.text)
+        if settings.enable_semantic_cache and full_text:
+            from app.services.lm_cache import lm_cache
 
-        # Step 1: Planning
+            await asyncio.to_thread(
+                lm_cache.set, user_prompt, full_text, settings.coding_model, semantic=semantic, context=system_prompt
+            )
+
+    async def _run_planning(self, user_request: str) -> Tuple[str, int]:
+        """Run the PlanningAgent, returning its plan text and latency in ms."""
         planning_agent = ChatAgent(
             name="PlanningAgent",
             description="Creates implementation plan",
@@ -688,14 +1040,31 @@ If NEEDS_REVISION, provide corrected code:
             system_message=self.prompts["PlanningAgent"]
         )
 
-        yield {"agent": "PlanningAgent", "type": "thinking", "status": "running", "message": "Creating plan..."}
-
         plan_msg = ChatMessage(role="user", text=user_request)
-        plan_text = ""
+        plan_chunks: List[str] = []
         start_time = time.time()
         async for update in planning_agent.run_stream(plan_msg):
-            plan_text += extract_text(update)
-        plan_latency = int((time.time() - start_time) * 1000)
+            plan_chunks.append(_extract_text(update))
+        return "".join(plan_chunks), int((time.time() - start_time) * 1000)
+
+    async def _execute_coding_workflow(
+        self,
+        user_request: str,
+        task_type: TaskType,
+        template: Dict[str, Any],
+        workflow_id: str,
+        max_iterations: int
+    ) -> AsyncGenerator[Dict[str, Any], None]:
+        """Execute the main coding workflow with review loop."""
+
+        # Step 1: Planning (may already be running since the supervisor phase)
+        yield {"agent": "PlanningAgent", "type": "thinking", "status": "running", "message": "Creating plan..."}
+
+        planning = self._speculative_plans.pop(workflow_id, None)
+        if planning is not None:
+            plan_text, plan_latency = await planning
+        else:
+            plan_text, plan_latency = await self._run_planning(user_request)
 
         checklist = parse_checklist(plan_text)
         yield {
@@ -720,73 +1089,46 @@ If NEEDS_REVISION, provide corrected code:
             system_message=self.prompts["CodingAgent"]
         )
 
-        all_artifacts = []
-        code_text = ""
-        existing_code = ""
-
-        for idx, task_item in enumerate(checklist):
-            task_num = idx + 1
-            task_desc = task_item["task"]
-
-            yield {
-                "agent": "CodingAgent",
-                "type": "thinking",
-                "status": "running",
-                "message": f"Task {task_num}/{len(checklist)}: {task_desc}",
-                "checklist": checklist
-            }
-
-            user_prompt = f"Request: {user_request}\n\nPlan:\n{plan_text}"
-            if existing_code:
-                user_prompt += f"\n\nExisting code:\n{existing_code}"
-            user_prompt += f"\n\nCurrent task ({task_num}/{len(checklist)}): {task_desc}"
+        # Tasks in one wave do not depend on each other and run concurrently
+        # when enabled; each task is given the code of all earlier waves
+        if settings.enable_parallel_coding:
+            waves = plan_task_waves(checklist)
+        else:
+            waves = [[idx] for idx in range(len(checklist))]
+
+        task_results: List[Optional[tuple]] = [None] * len(checklist)
+        existing_code_parts: List[str] = []  # Joined per wave; += would recopy all prior code
+        for wave in waves:
+            existing_code = "".join(existing_code_parts)
+            if len(wave) > 1:
+                task_updates = self._run_coding_tasks_parallel(
+                    coding_agent, checklist, wave, user_request, plan_text, existing_code, task_results
+                )
+            else:
+                task_updates = self._run_coding_task_streaming(
+                    coding_agent, checklist, wave[0], user_request, plan_text, existing_code, task_results
+                )
+            async for update in task_updates:
+                yield update
 
-            coding_msg = ChatMessage(role="user", text=user_prompt)
-            task_code = ""
-            start_time = time.time()
-            async for update in coding_agent.run_stream(coding_msg):
-                task_code += extract_text(update)
-            task_latency = int((time.time() - start_time) * 1000)
+            for idx in wave:
+                for artifact in task_results[idx][1]:
+                    existing_code_parts.append(f"\n\n```{artifact['language']} {artifact['filename']}\n{artifact['content']}\n```")
 
+        # Combine in checklist order, whatever order the waves ran tasks in
+        all_artifacts = []
+        code_text = ""
+        for task_code, task_artifacts in task_results:
             code_text += task_code + "\n"
-            task_artifacts = parse_code_blocks(task_code)
             all_artifacts.extend(task_artifacts)
 
-            for artifact in task_artifacts:
-                existing_code += f"\n\n```{artifact['language']} {artifact['filename']}\n{artifact['content']}\n```"
-                yield {
-                    "agent": "CodingAgent",
-                    "type": "artifact",
-                    "status": "running",
-                    "message": f"Created {artifact['filename']}",
-                    "artifact": artifact
-                }
-
-            checklist[idx]["completed"] = True
-            checklist[idx]["artifacts"] = [a["filename"] for a in task_artifacts]
-
-            yield {
-                "agent": "CodingAgent",
-                "type": "task_completed",
-                "status": "running",
-                "message": f"Task {task_num}/{len(checklist)} completed",
-                "task_result": {"task_num": task_num, "task": task_desc, "artifacts": task_artifacts},
-                "checklist": checklist,
-                "prompt_info": {
-                    "system_prompt": self.prompts["CodingAgent"],
-                    "user_prompt": user_prompt,
-                    "output": task_code,
-                    "model": settings.coding_model,
-                    "latency_ms": task_latency
-                }
-            }
-
         yield {"agent": "CodingAgent", "type": "completed", "status": "completed", "artifacts": all_artifacts, "checklist": checklist}
 
         # Step 3: Review Loop
         if template["has_review_loop"]:
             review_iteration = 0
             approved = False
+            reviewed_code = None  # code_text as of the previous review
 
             while not approved and review_iteration < max_iterations:
                 review_iteration += 1
@@ -800,27 +1142,28 @@ If NEEDS_REVISION, provide corrected code:
                     "iteration_info": {"current": review_iteration, "max": max_iterations}
                 }
 
-                review_agent = ChatAgent(
-                    name="ReviewAgent",
-                    description="Reviews code",
-                    chat_client=self.coding_client,
-                    system_message=self.prompts["ReviewAgent"]
-                )
-
-                review_msg = ChatMessage(role="user", text=f"Review this code:\n\n{code_text}")
-                review_text = ""
-                start_time = time.time()
-                async for update in review_agent.run_stream(review_msg):
-                    review_text += extract_text(update)
-                review_latency = int((time.time() - start_time) * 1000)
+                review_prompt = self._review_prompt(code_text, reviewed_code)
+                reviewed_code = code_text
+                review_run: Dict[str, Any] = {}
+                async for update in self._stream_agent_cached(
+                    "ReviewAgent", self._get_review_agent(), self.prompts["ReviewAgent"], review_prompt, review_run,
+                    semantic=True
+                ):
+                    yield update
+                review_text, review_latency, review_cached = review_run["text"], review_run["latency_ms"], review_run["cached"]
 
                 review_result = parse_review(review_text)
                 approved = review_result["approved"]
+                if review_prompt.startswith(_REVIEW_DIFF_PREFIX) or review_run["similar"]:
+                    # Code blocks in a diff review are fragments, not files,
+                    # and a similar prompt's corrections are for other code
+                    review_result["corrected_artifacts"] = []
 
                 yield {
                     "agent": "ReviewAgent",
                     "type": "completed",
                     "status": "completed",
+                    "cached": review_cached,
                     "analysis": review_result.get("analysis", ""),
                     "issues": review_result["issues"],
                     "suggestions": review_result["suggestions"],
@@ -828,7 +1171,7 @@ If NEEDS_REVISION, provide corrected code:
                     "corrected_artifacts": review_result["corrected_artifacts"],
                     "prompt_info": {
                         "system_prompt": self.prompts["ReviewAgent"],
-                        "user_prompt": f"Review this code:\n\n{code_text}",
+                        "user_prompt": review_prompt,
                         "output": review_text,
                         "model": settings.coding_model,
                         "latency_ms": review_latency
@@ -859,22 +1202,7 @@ If NEEDS_REVISION, provide corrected code:
                         "message": f"Fixing {len(review_result['issues'])} issues..."
                     }
 
-                    # Format issues
-                    def format_issue(issue):
-                        if isinstance(issue, dict):
-                            parts = []
-                            if issue.get("file"):
-                                parts.append(f"File: {issue['file']}")
-                            if issue.get("line"):
-                                parts.append(f"Line: {issue['line']}")
-                            if issue.get("issue"):
-                                parts.append(f"Issue: {issue['issue']}")
-                            if issue.get("fix"):
-                                parts.append(f"Fix: {issue['fix']}")
-                            return "\n  ".join(parts)
-                        return str(issue)
-
-                    issues_text = "\n".join(f"- {format_issue(i)}" for i in review_result["issues"]) or "None"
+                    issues_text = "\n".join(f"- {_format_issue(i)}" for i in review_result["issues"]) or "None"
                     fix_prompt = self.prompts["FixCodeAgent"].format(issues=issues_text)
 
                     fix_agent = ChatAgent(
@@ -884,12 +1212,13 @@ If NEEDS_REVISION, provide corrected code:
                         system_message=fix_prompt
                     )
 
-                    fix_msg = ChatMessage(role="user", text=f"Fix this code:\n\n{code_text}")
-                    fixed_code = ""
-                    start_time = time.time()
-                    async for update in fix_agent.run_stream(fix_msg):
-                        fixed_code += extract_text(update)
-                    fix_latency = int((time.time() - start_time) * 1000)
+                    fix_user_prompt = _FIX_PREFIX + code_text
+                    fix_run: Dict[str, Any] = {}
+                    async for update in self._stream_agent_cached(
+                        "FixCodeAgent", fix_agent, fix_prompt, fix_user_prompt, fix_run
+                    ):
+                        yield update
+                    fixed_code, fix_latency, fix_cached = fix_run["text"], fix_run["latency_ms"], fix_run["cached"]
 
                     code_text = fixed_code
                     fixed_artifacts = parse_code_blocks(fixed_code)
@@ -908,10 +1237,11 @@ If NEEDS_REVISION, provide corrected code:
                         "agent": "FixCodeAgent",
                         "type": "completed",
                         "status": "completed",
+                        "cached": fix_cached,
                         "artifacts": fixed_artifacts,
                         "prompt_info": {
                             "system_prompt": fix_prompt,
-                            "user_prompt": f"Fix this code:\n\n{code_text}",
+                            "user_prompt": fix_user_prompt,
                             "output": fixed_code,
                             "model": settings.coding_model,
                             "latency_ms": fix_latency
@@ -978,6 +1308,169 @@ If NEEDS_REVISION, provide corrected code:
                 }
             }
 
+    def _coding_task_updates(
+        self,
+        checklist: List[Dict[str, Any]],
+        idx: int,
+        user_prompt: str,
+        task_code: str,
+        task_artifacts: List[Dict[str, Any]],
+        task_latency: int,
+        artifacts_streamed: bool = False
+    ) -> List[Dict[str, Any]]:
+        """Mark a checklist task done and build its artifact and completion updates.
+
+        Artifact updates are skipped when artifacts_streamed is set, since the
+        caller already yielded them while the task was running.
+        """
+        task_num = idx + 1
+        updates = [] if artifacts_streamed else [self._artifact_update(artifact) for artifact in task_artifacts]
+
+        checklist[idx]["completed"] = True
+        checklist[idx]["artifacts"] = [a["filename"] for a in task_artifacts]
+
+        updates.append({
+            "agent": "CodingAgent",
+            "type": "task_completed",
+            "status": "running",
+            "message": f"Task {task_num}/{len(checklist)} completed",
+            "task_result": {"task_num": task_num, "task": checklist[idx]["task"], "artifacts": task_artifacts},
+            "checklist": checklist,
+            "prompt_info": {
+                "system_prompt": self.prompts["CodingAgent"],
+                "user_prompt": user_prompt,
+                "output": task_code,
+                "model": settings.coding_model,
+                "latency_ms": task_latency
+            }
+        })
+        return updates
+
+    def _artifact_update(self, artifact: Dict[str, Any]) -> Dict[str, Any]:
+        """Build the update announcing a newly created artifact."""
+        return {
+            "agent": "CodingAgent",
+            "type": "artifact",
+            "status": "running",
+            "message": f"Created {artifact['filename']}",
+            "artifact": artifact
+        }
+
+    def _coding_task_prompt(
+        self,
+        checklist: List[Dict[str, Any]],
+        idx: int,
+        user_request: str,
+        plan_text: str,
+        existing_code: str
+    ) -> str:
+        """Build the CodingAgent prompt for checklist task idx."""
+        user_prompt = f"Request: {user_request}\n\nPlan:\n{plan_text}"
+        if existing_code:
+            user_prompt += "\n\nExisting code:\n" + existing_code
+        return user_prompt + f"\n\nCurrent task ({idx + 1}/{len(checklist)}): {checklist[idx]['task']}"
+
+    async def _run_coding_task_streaming(
+        self,
+        coding_agent: ChatAgent,
+        checklist: List[Dict[str, Any]],
+        idx: int,
+        user_request: str,
+        plan_text: str,
+        existing_code: str,
+        task_results: List[Optional[tuple]]
+    ) -> AsyncGenerator[Dict[str, Any], None]:
+        """Run one checklist task, announcing each artifact as its code block closes.
+
+        task_results[idx] is filled with (task_code, task_artifacts).
+        """
+        yield {
+            "agent": "CodingAgent",
+            "type": "thinking",
+            "status": "running",
+            "message": f"Task {idx + 1}/{len(checklist)}: {checklist[idx]['task']}",
+            "checklist": checklist
+        }
+
+        user_prompt = self._coding_task_prompt(checklist, idx, user_request, plan_text, existing_code)
+        task_chunks: List[str] = []
+        streamed_artifacts = []
+        parser = CodeBlockParser()
+        start_time = time.time()
+        async for update in coding_agent.run_stream(ChatMessage(role="user", text=user_prompt)):
+            text = _extract_text(update)
+            task_chunks.append(text)
+            # Emit each artifact as soon as its closing fence arrives
+            for artifact in parser.add_chunk(text):
+                streamed_artifacts.append(artifact)
+                yield self._artifact_update(artifact)
+        task_latency = int((time.time() - start_time) * 1000)
+        task_code = "".join(task_chunks)
+
+        # The full output is parsed like in parallel mode, so both modes
+        # keep the same artifacts; announce any the stream did not
+        task_artifacts = parse_code_blocks(task_code)
+        for artifact in task_artifacts:
+            if artifact not in streamed_artifacts:
+                yield self._artifact_update(artifact)
+        task_results[idx] = (task_code, task_artifacts)
+
+        for update in self._coding_task_updates(
+            checklist, idx, user_prompt, task_code, task_artifacts, task_latency, artifacts_streamed=True
+        ):
+            yield update
+
+    async def _run_coding_tasks_parallel(
+        self,
+        coding_agent: ChatAgent,
+        checklist: List[Dict[str, Any]],
+        indexes: List[int],
+        user_request: str,
+        plan_text: str,
+        existing_code: str,
+        task_results: List[Optional[tuple]]
+    ) -> AsyncGenerator[Dict[str, Any], None]:
+        """Run the checklist tasks at indexes concurrently, streaming each task's results as it finishes.
+
+        At most settings.max_parallel_agents tasks call the LLM at once.
+        task_results[idx] is filled with (task_code, task_artifacts).
+        """
+        semaphore = asyncio.Semaphore(max(1, settings.max_parallel_agents))
+        total = len(checklist)
+
+        async def run_task(idx: int, user_prompt: str) -> tuple:
+            async with semaphore:
+                task_chunks: List[str] = []
+                start_time = time.time()
+                async for update in coding_agent.run_stream(ChatMessage(role="user", text=user_prompt)):
+                    task_chunks.append(_extract_text(update))
+                return idx, user_prompt, "".join(task_chunks), int((time.time() - start_time) * 1000)
+
+        tasks = []
+        for idx in indexes:
+            yield {
+                "agent": "CodingAgent",
+                "type": "thinking",
+                "status": "running",
+                "message": f"Task {idx + 1}/{total}: {checklist[idx]['task']}",
+                "checklist": checklist
+            }
+            user_prompt = self._coding_task_prompt(checklist, idx, user_request, plan_text, existing_code)
+            tasks.append(asyncio.create_task(run_task(idx, user_prompt)))
+
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                idx, user_prompt, task_code, task_latency = await next_done
+                task_artifacts = parse_code_blocks(task_code)
+                task_results[idx] = (task_code, task_artifacts)
+
+                for update in self._coding_task_updates(checklist, idx, user_prompt, task_code, task_artifacts, task_latency):
+                    yield update
+        finally:
+            # Stop remaining LLM calls if a task failed or the stream was closed
+            for task in tasks:
+                task.cancel()
+
     async def _execute_test_workflow(self, user_request: str, task_type: TaskType, template: Dict, workflow_id: str) -> AsyncGenerator[Dict[str, Any], None]:
         """Execute test generation workflow."""
         # Simplified - uses same pattern but with test-focused prompts
@@ -986,31 +1479,27 @@ If NEEDS_REVISION, provide corrected code:
 
     async def _execute_review_only_workflow(self, user_request: str, task_type: TaskType, template: Dict, workflow_id: str) -> AsyncGenerator[Dict[str, Any], None]:
         """Execute review-only workflow."""
-        def extract_text(update: ChatResponseUpdate) -> str:
-            return "".join(c.text for c in update.contents if isinstance(c, TextContent) and c.text)
-
         yield {"agent": "ReviewAgent", "type": "thinking", "status": "running", "message": "Reviewing code..."}
 
-        review_agent = ChatAgent(
-            name="ReviewAgent",
-            description="Reviews code",
-            chat_client=self.coding_client,
-            system_message=self.prompts["ReviewAgent"]
-        )
-
-        review_msg = ChatMessage(role="user", text=f"Review this code:\n\n{user_request}")
-        review_text = ""
-        start_time = time.time()
-        async for update in review_agent.run_stream(review_msg):
-            review_text += extract_text(update)
-        review_latency = int((time.time() - start_time) * 1000)
+        review_prompt = _REVIEW_PREFIX + user_request
+        review_run: Dict[str, Any] = {}
+        async for update in self._stream_agent_cached(
+            "ReviewAgent", self._get_review_agent(), self.prompts["ReviewAgent"], review_prompt, review_run,
+            semantic=True
+        ):
+            yield update
+        review_text, review_latency, review_cached = review_run["text"], review_run["latency_ms"], review_run["cached"]
 
         review_result = parse_review(review_text)
+        if review_run["similar"]:
+            # Corrections from a similar prompt are for other code
+            review_result["corrected_artifacts"] = []
 
         yield {
             "agent": "ReviewAgent",
             "type": "completed",
             "status": "completed",
+            "cached": review_cached,
             "analysis": review_result.get("analysis", ""),
             "issues": review_result["issues"],
             "suggestions": review_result["suggestions"],
@@ -1018,7 +1507,7 @@ If NEEDS_REVISION, provide corrected code:
             "corrected_artifacts": review_result["corrected_artifacts"],
             "prompt_info": {
                 "system_prompt": self.prompts["ReviewAgent"],
-                "user_prompt": f"Review this code:\n\n{user_request}",
+                "user_prompt": review_prompt,
                 "output": review_text,
                 "model": settings.coding_model,
                 "latency_ms": review_latency
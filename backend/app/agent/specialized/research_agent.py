@@ -2,6 +2,7 @@
 Research Agent - Specialized in code exploration and analysis
 """
 
+import asyncio
 from typing import Dict, Any
 from .base_specialized_agent import BaseSpecializedAgent, AgentCapabilities
 
@@ -92,45 +93,58 @@ RECOMMENDATIONS:
             "context": {}
         }
 
-        # Example workflow (in production, this would use LLM to decide):
+        # Example workflow (in production, this would use LLM to decide).
+        # The tool calls are independent, so they run concurrently.
+        calls = []
 
         # 1. If search pattern provided, search for files
         if "search_pattern" in context:
-            search_result = await self.use_tool(
+            calls.append(("search", self.use_tool(
                 "search_files",
                 {"pattern": context["search_pattern"]}
-            )
-            if search_result.success:
-                results["relevant_files"] = search_result.output
-                results["findings"].append(
-                    f"Found {len(search_result.output)} files matching pattern"
-                )
+            )))
 
         # 2. If directory provided, list contents
         if "directory" in context:
-            dir_result = await self.use_tool(
+            calls.append(("directory", self.use_tool(
                 "list_directory",
                 {"path": context["directory"]}
-            )
-            if dir_result.success:
-                results["context"]["directory_contents"] = dir_result.output
-                results["findings"].append(
-                    f"Listed {len(dir_result.output)} items in directory"
-                )
+            )))
 
         # 3. If file path provided, read it
         if "file_path" in context:
-            file_result = await self.use_tool(
+            calls.append(("file", self.use_tool(
                 "read_file",
                 {"path": context["file_path"]}
-            )
-            if file_result.success:
-                results["context"]["file_content"] = file_result.output
-                results["findings"].append(f"Read file: {context['file_path']}")
+            )))
 
         # 4. Get git status
-        git_status = await self.use_tool("git_status", {})
-        if git_status.success:
-            results["context"]["git_status"] = git_status.output
+        calls.append(("git_status", self.use_tool("git_status", {})))
+
+        outcomes = await asyncio.gather(*(call for _, call in calls), return_exceptions=True)
+
+        # Apply in call order; the first failure is raised as it was when
+        # the calls ran one after another
+        for (key, _), outcome in zip(calls, outcomes):
+            if isinstance(outcome, BaseException):
+                raise outcome
+            if not outcome.success:
+                continue
+
+            if key == "search":
+                results["relevant_files"] = outcome.output
+                results["findings"].append(
+                    f"Found {len(outcome.output)} files matching pattern"
+                )
+            elif key == "directory":
+                results["context"]["directory_contents"] = outcome.output
+                results["findings"].append(
+                    f"Listed {len(outcome.output)} items in directory"
+                )
+            elif key == "file":
+                results["context"]["file_content"] = outcome.output
+                results["findings"].append(f"Read file: {context['file_path']}")
+            else:
+                results["context"]["git_status"] = outcome.output
 
         return results
@@ -2,6 +2,7 @@
 Testing Agent - Specialized in test generation and execution
 """
 
+import asyncio
 from typing import Dict, Any
 from .base_specialized_agent import BaseSpecializedAgent, AgentCapabilities
 
@@ -105,30 +106,45 @@ ISSUES_FOUND:
             "issues": []
         }
 
-        # Example workflow:
+        # Example workflow. Reading the source overlaps with running the
+        # existing tests; a failed read still stops before a test file is
+        # written, as when the steps ran one after another
 
         # 1. If source file provided, read it
-        if "source_file" in context:
-            source_result = await self.use_tool(
-                "read_file",
-                {"path": context["source_file"]}
-            )
-            if source_result.success:
-                results["source_code"] = source_result.output
+        async def read_source() -> None:
+            if "source_file" in context:
+                source_result = await self.use_tool(
+                    "read_file",
+                    {"path": context["source_file"]}
+                )
+                if source_result.success:
+                    results["source_code"] = source_result.output
 
         # 2. If test file path provided, run tests
-        if "test_path" in context:
-            test_result = await self.use_tool(
-                "run_tests",
-                {"test_path": context["test_path"]}
-            )
-            if test_result.success:
-                results["test_results"] = test_result.output
-                results["passed"] = test_result.output.get("passed", False)
-            else:
-                results["issues"].append(test_result.error)
-
-        # 3. If test code provided, write and run it
+        async def run_existing_tests() -> None:
+            if "test_path" in context:
+                test_result = await self.use_tool(
+                    "run_tests",
+                    {"test_path": context["test_path"]}
+                )
+                if test_result.success:
+                    results["test_results"] = test_result.output
+                    results["passed"] = test_result.output.get("passed", False)
+                else:
+                    results["issues"].append(test_result.error)
+
+        tasks = [asyncio.create_task(read_source()), asyncio.create_task(run_existing_tests())]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                await next_done
+        finally:
+            # Stop the other step if one failed
+            for pending in tasks:
+                pending.cancel()
+
+        # 3. If test code provided, write and run it. This stays after step 2:
+        # the new test file may sit under test_path, and its results replace
+        # the earlier ones
         if "test_code" in context and "test_file_path" in context:
             write_result = await self.use_tool(
                 "write_file",
@@ -159,6 +159,21 @@ class Settings(BaseSettings):
     # Workflow Configuration
     max_review_iterations: int = 1  # Maximum code review/fix iterations (default: 1 for speed)
 
+    # Reuse the supervisor's task analysis for identical requests (0 disables)
+    supervisor_cache_ttl_seconds: int = 3600
+
+    # Serve ReviewAgent/FixCodeAgent calls from the LM cache, including
+    # near-identical prompts at or above this cosine similarity
+    enable_semantic_cache: bool = False
+    semantic_cache_threshold: float = 0.97
+
+    # Maximum debug log entries kept per node run and in workflow state
+    # (oldest entries are dropped)
+    debug_log_cap: int = 500
+
+    # Plan execution admission budget (sum of step complexity weights: low=1, medium=3, high=8)
+    max_plan_budget: int = 1000
+
     # Coder batch size - for parallel file generation display
     # Higher values for powerful GPUs (H100: 10-15, A100: 8-10, RTX 4090: 5-8)
     coder_batch_size: int = 10  # Default optimized for H100
@@ -62,6 +62,14 @@ class HITLManager:
         self._broadcast_callback = callback
         logger.info("WebSocket broadcast callback set")
 
+    def is_enabled(self) -> bool:
+        """Check whether HITL is wired to a client
+
+        Returns:
+            True if a WebSocket broadcast callback has been registered
+        """
+        return self._broadcast_callback is not None
+
     async def request_human_input(
         self,
         request: HITLRequest,
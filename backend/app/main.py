@@ -138,7 +138,8 @@ async def health():
         from app.agent.langgraph.unified_workflow import unified_workflow
         health_status["components"]["langgraph_workflow"] = {
             "status": "operational",
-            "graph_compiled": unified_workflow.graph is not None,
+            "graph_compiled": unified_workflow.compiled_graphs > 0,
+            "compiled_graphs": unified_workflow.compiled_graphs,
             "tools_available": len(unified_workflow.tools)
         }
     except Exception as e:
@@ -4,10 +4,13 @@ import json
 import hashlib
 import logging
 import time
+from difflib import SequenceMatcher
 from typing import Optional, Dict, Any, List
 from dataclasses import dataclass, asdict
 from datetime import datetime, timedelta
 
+from app.services.vector_db import VectorDBService
+
 logger = logging.getLogger(__name__)
 
 # Data directory for file-based cache
@@ -33,9 +36,21 @@ class LMCacheService:
     """Cache service for LLM responses.
 
     Supports both Redis (if available) and file-based caching.
-    Uses semantic similarity for cache matching when vector_db is enabled.
+    Uses semantic similarity for cache matching via get_similar, for
+    prompts cached with semantic=True.
     """
 
+    # ChromaDB collection indexing cached prompts for similarity lookup
+    PROMPT_INDEX_COLLECTION = "lm_cache_prompts"
+
+    # Minimum seconds between sweeps of expired prompts from the index
+    PROMPT_INDEX_PRUNE_INTERVAL = 3600
+
+    # Longest prompt indexed for similarity lookup. The default ChromaDB
+    # embedding truncates at 256 tokens, so longer prompts that differ
+    # past that point would embed identically.
+    PROMPT_INDEX_MAX_CHARS = 768
+
     def __init__(
         self,
         ttl_hours: int = 24,
@@ -54,6 +69,8 @@ class LMCacheService:
         self._redis_client = None
         self._use_redis = use_redis
         self._redis_available = False
+        self._prompt_index: Optional[VectorDBService] = None
+        self._prompt_index_pruned_at = float("-inf")
 
         if use_redis:
             self._init_redis()
@@ -83,7 +100,8 @@ class LMCacheService:
         Args:
             prompt: The LLM prompt
             model: Model name
-            **kwargs: Additional parameters to include in key
+            **kwargs: Additional parameters to include in key, such as
+                context (e.g. a system prompt) sent alongside the prompt
 
         Returns:
             Cache key string
@@ -95,6 +113,8 @@ class LMCacheService:
             "temperature": kwargs.get("temperature", 0.7),
             "max_tokens": kwargs.get("max_tokens", 2048),
         }
+        if kwargs.get("context"):
+            key_data["context"] = kwargs["context"]
         key_string = json.dumps(key_data, sort_keys=True)
         return hashlib.sha256(key_string.encode()).hexdigest()
 
@@ -113,8 +133,77 @@ class LMCacheService:
         Returns:
             Cached response or None
         """
-        key = self._generate_key(prompt, model, **kwargs)
+        return self._get_by_key(self._generate_key(prompt, model, **kwargs))
+
+    def get_similar(
+        self,
+        prompt: str,
+        model: str,
+        threshold: float = 0.97,
+        **kwargs
+    ) -> Optional[str]:
+        """Get cached response for prompt or a near-identical prompt.
+
+        Falls back to the most similar prompt cached with semantic=True for
+        the same model and context when there is no exact entry. Only the
+        prompt is embedded, and a hit must also pass threshold as a text
+        similarity ratio against the indexed prompt.
+
+        Args:
+            prompt: The LLM prompt
+            model: Model name
+            threshold: Minimum cosine and text similarity for a semantic hit
+            **kwargs: Additional parameters, including context
+
+        Returns:
+            Cached response or None
+        """
+        response = self.get(prompt, model, **kwargs)
+        if response is not None or len(prompt) > self.PROMPT_INDEX_MAX_CHARS:
+            return response
+
+        context_hash = self._context_hash(kwargs.get("context", ""))
+        results = self.prompt_index.search(
+            prompt, n_results=1, filter_metadata={"$and": [{"model": model}, {"context": context_hash}]}
+        )
+        if (
+            results
+            and 1.0 - results[0].distance >= threshold
+            and self._is_near_copy(prompt, results[0].content, threshold)
+        ):
+            response = self._get_by_key(results[0].id)
+            if response is None:
+                # The entry expired; drop its prompt from the index too
+                self.prompt_index.delete_documents(ids=[results[0].id])
+            else:
+                logger.debug(f"Semantic cache hit: {results[0].id[:16]}...")
+            return response
+        return None
+
+    @staticmethod
+    def _context_hash(context: str) -> str:
+        """Hash of a prompt's context, for filtering the prompt index."""
+        return hashlib.md5(context.encode()).hexdigest()
+
+    @staticmethod
+    def _is_near_copy(prompt: str, indexed: str, threshold: float) -> bool:
+        """Check an indexed prompt against prompt as text, cheapest bounds first."""
+        matcher = SequenceMatcher(None, prompt, indexed)
+        return (
+            matcher.real_quick_ratio() >= threshold
+            and matcher.quick_ratio() >= threshold
+            and matcher.ratio() >= threshold
+        )
 
+    @property
+    def prompt_index(self) -> VectorDBService:
+        """Get the vector index of cached prompts (lazy initialization)."""
+        if self._prompt_index is None:
+            self._prompt_index = VectorDBService(collection_name=self.PROMPT_INDEX_COLLECTION)
+        return self._prompt_index
+
+    def _get_by_key(self, key: str) -> Optional[str]:
+        """Get cached response by cache key."""
         if self._redis_available:
             return self._get_redis(key)
         else:
@@ -170,6 +259,7 @@ class LMCacheService:
         response: str,
         model: str,
         metadata: Optional[Dict[str, Any]] = None,
+        semantic: bool = False,
         **kwargs
     ) -> str:
         """Cache LLM response.
@@ -179,7 +269,9 @@ class LMCacheService:
             response: The LLM response
             model: Model name
             metadata: Optional metadata
-            **kwargs: Additional parameters
+            semantic: Also index the prompt for get_similar lookups, if it
+                is no longer than PROMPT_INDEX_MAX_CHARS
+            **kwargs: Additional parameters, including context
 
         Returns:
             Cache key
@@ -202,8 +294,30 @@ class LMCacheService:
         else:
             self._set_file(key, entry)
 
+        if semantic and len(prompt) <= self.PROMPT_INDEX_MAX_CHARS:
+            try:
+                self.prompt_index.add_documents(
+                    documents=[prompt],
+                    ids=[key],
+                    metadatas=[{
+                        "model": model,
+                        "context": self._context_hash(kwargs.get("context", "")),
+                        "expires_at": time.time() + self.ttl_hours * 3600,
+                    }]
+                )
+            except Exception as e:
+                logger.warning(f"Prompt indexing failed, exact matches only: {e}")
+            else:
+                if time.time() - self._prompt_index_pruned_at >= self.PROMPT_INDEX_PRUNE_INTERVAL:
+                    self._prune_prompt_index()
+
         return key
 
+    def _prune_prompt_index(self) -> None:
+        """Remove prompts whose cache entries have expired from the index."""
+        self._prompt_index_pruned_at = time.time()
+        self.prompt_index.delete_documents(where={"expires_at": {"$lt": self._prompt_index_pruned_at}})
+
     def _set_redis(self, key: str, entry: CacheEntry) -> None:
         """Set in Redis cache."""
         try:
@@ -322,11 +436,14 @@ class LMCacheService:
         return stats
 
     def cleanup_expired(self) -> int:
-        """Remove expired cache entries (file-based only).
+        """Remove expired cache entries and indexed prompts.
 
         Returns:
-            Number of entries removed
+            Number of file cache entries removed
         """
+        if self._prompt_index is not None:
+            self._prune_prompt_index()
+
         if self._redis_available:
             # Redis handles expiration automatically
             return 0
@@ -226,6 +226,22 @@ class VectorDBService:
         except Exception as e:
             logger.error(f"Failed to delete documents: {e}")
 
+    def delete_documents(
+        self,
+        ids: Optional[List[str]] = None,
+        where: Optional[Dict[str, Any]] = None
+    ) -> None:
+        """Delete documents by ID and/or metadata filter.
+
+        Args:
+            ids: Optional list of document IDs
+            where: Optional metadata filter
+        """
+        try:
+            self.collection.delete(ids=ids, where=where)
+        except Exception as e:
+            logger.error(f"Failed to delete documents: {e}")
+
     def get_stats(self) -> Dict[str, Any]:
         """Get vector database statistics.
 
@@ -0,0 +1,33 @@
+"""Cached ISO timestamps for high-frequency event streams"""
+
+import time
+from datetime import datetime
+
+
+class CachedTimestamp:
+    """UTC ISO timestamp that is reformatted at most once per resolution window
+
+    Streams that emit many events per second reuse the formatted string
+    instead of calling datetime.utcnow().isoformat() for every event.
+    """
+
+    def __init__(self, resolution: float = 0.01):
+        """
+        Args:
+            resolution: Seconds a formatted timestamp is reused for
+        """
+        self.resolution = resolution
+        self._tick = float("-inf")
+        self._value = ""
+
+    def now_iso(self) -> str:
+        """Get the current UTC timestamp
+
+        Returns:
+            ISO formatted timestamp string
+        """
+        tick = time.monotonic()
+        if tick - self._tick >= self.resolution:
+            self._value = datetime.utcnow().isoformat()
+            self._tick = tick
+        return self._value
@@ -51,6 +51,14 @@ from core.agent_tools import get_agent_tools
 
 logger = logging.getLogger(__name__)
 
+# Task type keywords in priority order ("testing"/"unit test" are covered by "test")
+_TASK_TYPE_KEYWORDS = (
+    ("testing", ("test",)),
+    ("security_audit", ("security", "vulnerability", "owasp")),
+    ("review", ("review", "check", "analyze")),
+    ("implementation", ("implement", "create", "add", "build")),
+)
+
 
 class TaskComplexity:
     """Task complexity levels"""
@@ -730,17 +738,12 @@ class SupervisorAgent:
         """Determine primary task type"""
         request_lower = request.lower()
 
-        # Check in priority order
-        if any(word in request_lower for word in ["test", "testing", "unit test"]):
-            return "testing"
-        elif any(word in request_lower for word in ["security", "vulnerability", "owasp"]):
-            return "security_audit"
-        elif any(word in request_lower for word in ["review", "check", "analyze"]):
-            return "review"
-        elif any(word in request_lower for word in ["implement", "create", "add", "build"]):
-            return "implementation"
-        else:
-            return "general"
+        # Check in priority order; substring checks beat a regex scan here
+        for task_type, keywords in _TASK_TYPE_KEYWORDS:
+            for keyword in keywords:
+                if keyword in request_lower:
+                    return task_type
+        return "general"
 
     def _determine_required_agents(self, request: str) -> List[str]:
         """Determine which agents are needed
@@ -0,0 +1,113 @@
+"""Tests for LMCacheService semantic lookup."""
+import pytest
+from unittest.mock import MagicMock, call
+
+from app.services import lm_cache as lm_cache_module
+from app.services.lm_cache import LMCacheService
+from app.services.vector_db import SearchResult
+
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch):
+    """File-backed cache in a temporary directory with a mocked prompt index."""
+    monkeypatch.setattr(lm_cache_module, "CACHE_DIR", str(tmp_path))
+    service = LMCacheService(use_redis=False)
+    service._prompt_index = MagicMock()
+    service._prompt_index.search.return_value = []
+    return service
+
+
+class TestSemanticLookup:
+    """Test LMCacheService.get_similar."""
+
+    def test_exact_match_skips_index(self, cache):
+        """An exact entry is returned without a similarity search."""
+        cache.set("Review this code", "LGTM", "coder")
+
+        assert cache.get_similar("Review this code", "coder") == "LGTM"
+        cache.prompt_index.search.assert_not_called()
+
+    def test_similar_prompt_above_threshold(self, cache):
+        """The nearest indexed prompt is served when similar enough."""
+        key = cache.set("Review this code:\n\nx = 1", "LGTM", "coder", semantic=True)
+        cache.prompt_index.add_documents.assert_called_once()
+        assert cache.prompt_index.add_documents.call_args.kwargs["ids"] == [key]
+        assert cache.prompt_index.add_documents.call_args.kwargs["metadatas"][0]["model"] == "coder"
+        cache.prompt_index.search.return_value = [
+            SearchResult(id=key, content="Review this code:\n\nx = 1", metadata={"model": "coder"}, distance=0.02)
+        ]
+
+        assert cache.get_similar("Review this code:\n\nx = 1 ", "coder", threshold=0.97) == "LGTM"
+        assert cache.get_similar("Review this code:\n\nx = 1 ", "coder", threshold=0.99) is None
+
+    def test_similar_embedding_of_different_text_misses(self, cache):
+        """A close embedding is not a hit unless the prompt text is close too."""
+        key = cache.set("Review this code:\n\nx = 1", "LGTM", "coder", semantic=True)
+        cache.prompt_index.search.return_value = [
+            SearchResult(id=key, content="Review this code:\n\nx = 1", metadata={"model": "coder"}, distance=0.0)
+        ]
+
+        assert cache.get_similar("Review this code:\n\nx = 1\ny = x / 0", "coder") is None
+
+    def test_context_is_filtered_not_embedded(self, cache):
+        """Only the prompt is indexed; the context must match exactly."""
+        cache.set("Review this code", "LGTM", "coder", semantic=True, context="system")
+
+        assert cache.prompt_index.add_documents.call_args.kwargs["documents"] == ["Review this code"]
+        assert cache.get("Review this code", "coder") is None
+        assert cache.get("Review this code", "coder", context="system") == "LGTM"
+
+        cache.get_similar("Review this code ", "coder", context="system")
+        where = cache.prompt_index.search.call_args.kwargs["filter_metadata"]
+        metadata = cache.prompt_index.add_documents.call_args.kwargs["metadatas"][0]
+        assert {"context": metadata["context"]} in where["$and"]
+
+    def test_long_prompt_is_exact_only(self, cache):
+        """Prompts the embedding would truncate are neither indexed nor searched."""
+        prompt = "x" * (LMCacheService.PROMPT_INDEX_MAX_CHARS + 1)
+
+        cache.set(prompt, "LGTM", "coder", semantic=True)
+
+        cache.prompt_index.add_documents.assert_not_called()
+        assert cache.get_similar(prompt + " ", "coder") is None
+        cache.prompt_index.search.assert_not_called()
+
+    def test_index_failure_keeps_exact_entry(self, cache):
+        """A failing prompt index does not prevent caching."""
+        cache.prompt_index.add_documents.side_effect = RuntimeError("ChromaDB not installed")
+
+        cache.set("prompt", "response", "coder", semantic=True)
+
+        assert cache.get("prompt", "coder") == "response"
+
+
+class TestPromptIndexExpiry:
+    """Test removal of expired prompts from the index."""
+
+    def test_expired_hit_is_removed_from_index(self, cache):
+        """A semantic hit whose entry expired is a miss and leaves the index."""
+        key = cache.set("prompt", "response", "coder", semantic=True)
+        cache.delete("prompt", "coder")
+        cache.prompt_index.search.return_value = [
+            SearchResult(id=key, content="prompt", metadata={"model": "coder"}, distance=0.0)
+        ]
+
+        assert cache.get_similar("prompt ", "coder", threshold=0.9) is None
+        cache.prompt_index.delete_documents.assert_called_with(ids=[key])
+
+    def test_set_prunes_index_once_per_interval(self, cache, monkeypatch):
+        """Expired prompts are swept from the index at most once per interval."""
+        clock = [1000.0]
+        monkeypatch.setattr(lm_cache_module.time, "time", lambda: clock[0])
+
+        cache.set("a", "1", "coder", semantic=True)
+        cache.set("b", "2", "coder", semantic=True)
+        clock[0] += LMCacheService.PROMPT_INDEX_PRUNE_INTERVAL
+        cache.set("c", "3", "coder", semantic=True)
+
+        metadata = cache.prompt_index.add_documents.call_args_list[0].kwargs["metadatas"][0]
+        assert metadata["expires_at"] == 1000.0 + cache.ttl_hours * 3600
+        assert cache.prompt_index.delete_documents.call_args_list == [
+            call(where={"expires_at": {"$lt": 1000.0}}),
+            call(where={"expires_at": {"$lt": 1000.0 + LMCacheService.PROMPT_INDEX_PRUNE_INTERVAL}}),
+        ]
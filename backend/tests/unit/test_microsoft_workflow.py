@@ -0,0 +1,380 @@
+"""Unit tests for the Microsoft Agent Framework workflow
+
+Runs DynamicCodingWorkflow against stub agents, so neither an LLM nor
+a full agent_framework install is required:
+- Streamed agent output and the semantic LM cache
+- Streaming code block parsing in the coding workflow
+- Dependency waves, ordering and cancellation of coding tasks
+"""
+
+import asyncio
+import importlib
+import re
+import sys
+import types
+from typing import Callable, Dict, List, Union
+from unittest.mock import MagicMock
+
+import pytest
+
+from app.core.config import settings
+
+
+class _Stub:
+    """Stand-in for agent_framework classes the workflow only constructs"""
+
+    def __init__(self, *args, **kwargs):
+        self.__dict__.update(kwargs)
+
+
+class TextContent:
+    def __init__(self, text: str):
+        self.text = text
+
+
+@pytest.fixture(scope="module")
+def wm():
+    """workflow_manager imported against a stub agent_framework"""
+    stub = types.ModuleType("agent_framework")
+    for name in ("WorkflowBuilder", "ChatAgent", "AgentRunContext", "ChatMessage", "BaseChatClient", "ChatResponseUpdate"):
+        setattr(stub, name, type(name, (_Stub,), {}))
+    stub.TextContent = TextContent
+
+    def is_swapped(name: str) -> bool:
+        return name == "agent_framework" or name.startswith("app.agent.microsoft")
+
+    saved = {name: module for name, module in sys.modules.items() if is_swapped(name)}
+    for name in saved:
+        del sys.modules[name]
+    sys.modules["agent_framework"] = stub
+    try:
+        yield importlib.import_module("app.agent.microsoft.workflow_manager")
+    finally:
+        for name in [name for name in sys.modules if is_swapped(name)]:
+            del sys.modules[name]
+        sys.modules.update(saved)
+
+
+@pytest.fixture
+def outputs(wm, monkeypatch) -> Dict[str, Union[List[str], Callable]]:
+    """Chunks each stub agent streams, by agent name
+
+    A value may also be an async generator function, called with the
+    prompt text, that yields the chunks.
+    """
+    outputs: Dict[str, Union[List[str], Callable]] = {}
+
+    class StubAgent:
+        def __init__(self, name: str, **kwargs):
+            self.name = name
+
+        async def run_stream(self, message):
+            source = outputs.get(self.name, [])
+            if callable(source):
+                async for chunk in source(message.text):
+                    yield types.SimpleNamespace(contents=[TextContent(chunk)])
+            else:
+                for chunk in source:
+                    yield types.SimpleNamespace(contents=[TextContent(chunk)])
+
+    monkeypatch.setattr(wm, "ChatAgent", StubAgent)
+    return outputs
+
+
+@pytest.fixture
+def lm_cache(wm, monkeypatch):
+    """Semantic cache enabled, backed by a mock that always misses"""
+    cache = MagicMock()
+    cache.get.return_value = None
+    cache.get_similar.return_value = None
+    monkeypatch.setitem(sys.modules, "app.services.lm_cache", types.SimpleNamespace(lm_cache=cache))
+    monkeypatch.setattr(settings, "enable_semantic_cache", True)
+    return cache
+
+
+async def _run_coding(wm, monkeypatch, parallel: bool, max_iterations: int = 0) -> List[Dict]:
+    """Run the coding workflow, reviewing only if max_iterations is set, collecting its updates"""
+    monkeypatch.setattr(settings, "enable_parallel_coding", parallel)
+    template = {"name": "test", "nodes": [], "has_review_loop": max_iterations > 0}
+    updates = wm.DynamicCodingWorkflow()._execute_coding_workflow(
+        "request", "code_generation", template, "wf", max_iterations
+    )
+    return [update async for update in updates]
+
+
+def _coding_artifacts(updates: List[Dict]) -> List[Dict]:
+    return next(u for u in updates if u["agent"] == "CodingAgent" and u["type"] == "completed")["artifacts"]
+
+
+async def _stream(
+    wm, agent_name: str, user_prompt: str = "Review this code:\n\nx = 1", semantic: bool = True
+) -> Dict:
+    result: Dict = {}
+    updates = wm.DynamicCodingWorkflow()._stream_agent_cached(
+        agent_name, wm.ChatAgent(name=agent_name), "system", user_prompt, result, semantic=semantic
+    )
+    async for _ in updates:
+        pass
+    return result
+
+
+class TestStreamAgentCached:
+    """Test DynamicCodingWorkflow._stream_agent_cached"""
+
+    @pytest.mark.asyncio
+    async def test_caches_full_output(self, wm, outputs, lm_cache):
+        """The whole streamed response is returned and cached, not the last chunk"""
+        outputs["ReviewAgent"] = ["STATUS: ", "NEEDS_REVISION\n", "ISSUES: x"]
+
+        result = await _stream(wm, "ReviewAgent")
+
+        assert result["text"] == "STATUS: NEEDS_REVISION\nISSUES: x"
+        assert result["cached"] is False
+        lm_cache.set.assert_called_once()
+        assert lm_cache.set.call_args.args[1] == "STATUS: NEEDS_REVISION\nISSUES: x"
+
+    @pytest.mark.asyncio
+    async def test_empty_output_is_not_cached(self, wm, outputs, lm_cache):
+        """An agent that streams nothing yields empty text and no cache entry"""
+        result = await _stream(wm, "ReviewAgent")
+
+        assert result["text"] == ""
+        lm_cache.set.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_cache_hit_skips_agent(self, wm, outputs, lm_cache):
+        """A cached response is served without running the agent"""
+        outputs["ReviewAgent"] = ["fresh"]
+        lm_cache.get_similar.return_value = "STATUS: APPROVED"
+
+        result = await _stream(wm, "ReviewAgent")
+
+        assert result == {"text": "STATUS: APPROVED", "latency_ms": 0, "cached": True, "similar": True}
+        lm_cache.set.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_only_user_prompt_is_matched(self, wm, outputs, lm_cache):
+        """The system prompt is passed as exact context, not embedded"""
+        outputs["ReviewAgent"] = ["STATUS: APPROVED"]
+
+        await _stream(wm, "ReviewAgent")
+
+        assert lm_cache.get_similar.call_args.args[0] == "Review this code:\n\nx = 1"
+        assert lm_cache.get_similar.call_args.kwargs["context"] == "system"
+        assert lm_cache.set.call_args.args[0] == "Review this code:\n\nx = 1"
+        assert lm_cache.set.call_args.kwargs["context"] == "system"
+
+    @pytest.mark.asyncio
+    async def test_similar_review_drops_corrections(self, wm, outputs, lm_cache):
+        """Corrected code from a near-identical review is for other code"""
+        lm_cache.get_similar.return_value = "STATUS: NEEDS_REVISION\n```python\n# app.py\nx = 2\n```"
+
+        updates = wm.DynamicCodingWorkflow()._execute_review_only_workflow(
+            "x = 1", "code_review", {"name": "review", "nodes": []}, "wf"
+        )
+        completed = [u async for u in updates if u["agent"] == "ReviewAgent" and u["type"] == "completed"]
+
+        assert completed[0]["cached"] is True
+        assert completed[0]["corrected_artifacts"] == []
+
+    @pytest.mark.asyncio
+    async def test_non_semantic_agent_needs_exact_match(self, wm, outputs, lm_cache):
+        """Fixes are only reused for exactly the same code"""
+        outputs["FixCodeAgent"] = ["fixed"]
+        lm_cache.get_similar.return_value = "fix for other code"
+
+        result = await _stream(wm, "FixCodeAgent", "Fix this code:\n\nx = 1", semantic=False)
+
+        assert result["text"] == "fixed"
+        lm_cache.get.assert_called_once()
+        lm_cache.get_similar.assert_not_called()
+        assert lm_cache.set.call_args.kwargs["semantic"] is False
+
+
+class TestSupervisorCache:
+    """Test reuse of SupervisorAgent analyses"""
+
+    @pytest.mark.asyncio
+    async def test_cache_hit_reports_no_latency(self, wm, outputs, monkeypatch):
+        """A repeated request is classified from the cache in no model time"""
+        calls = []
+
+        async def supervisor(prompt):
+            calls.append(prompt)
+            await asyncio.sleep(0.01)
+            yield "TASK_TYPE: code_review"
+
+        outputs["SupervisorAgent"] = supervisor
+        monkeypatch.setattr(settings, "enable_parallel_coding", False)
+        monkeypatch.setattr(wm, "_supervisor_cache", wm.ResultCache(max_size=4, ttl_seconds=60))
+
+        completed = []
+        for _ in range(2):
+            updates = wm.DynamicCodingWorkflow().execute_stream("review x = 1")
+            async for update in updates:
+                if update["agent"] == "SupervisorAgent" and update["type"] == "completed":
+                    completed.append(update)
+                    break
+            await updates.aclose()
+
+        assert len(calls) == 1
+        assert [u["cached"] for u in completed] == [False, True]
+        assert completed[0]["prompt_info"]["latency_ms"] > 0
+        assert completed[1]["prompt_info"]["latency_ms"] == 0
+        assert completed[1]["prompt_info"]["output"] == "TASK_TYPE: code_review"
+
+
+class TestCodeBlockParsing:
+    """Test CodeBlockParser against parse_code_blocks"""
+
+    @pytest.mark.parametrize("text", [
+        "```python\nprint(1)\n```",
+        "Use ```inline``` fences.\n```js app.js\nconst a = `${b}`;\n```\nDone",
+        "```python\nmain.py\nx = 1\n```\n```\n# util.py\ny = 2\n```",
+        "```python\nx = 1\n```\n```python\nx = 1\n```",
+    ])
+    def test_chunked_parse_matches_full_parse(self, wm, text):
+        """Feeding text one character at a time finds the same blocks"""
+        parser = wm.CodeBlockParser()
+        artifacts = [artifact for char in text for artifact in parser.add_chunk(char)]
+
+        assert artifacts == wm.parse_code_blocks(text)
+
+    def test_oversized_block_is_skipped_to_its_closing_fence(self, wm, monkeypatch):
+        """Blocks after a dropped oversized block are still parsed correctly"""
+        monkeypatch.setattr(wm.CodeBlockParser, "MAX_CODE_BLOCK", 16)
+        parser = wm.CodeBlockParser()
+        chunks = ["```python big.py\n", "x = 1\n" * 10, "``", "`\nText\n```python small.py\ny = 2\n```\n"]
+
+        artifacts = [artifact for chunk in chunks for artifact in parser.add_chunk(chunk)]
+
+        assert [(a["filename"], a["content"]) for a in artifacts] == [("small.py", "y = 2")]
+        assert parser.buffer == "\n"
+
+    @pytest.mark.asyncio
+    async def test_sequential_and_parallel_artifacts_match(self, wm, outputs, monkeypatch):
+        """Both coding modes keep the artifacts parse_code_blocks finds
+
+        The second block closes without a preceding newline, which the
+        streaming parser alone cannot settle before the output ends.
+        """
+        outputs["PlanningAgent"] = ["1. Model\n2. API (depends: none)\n"]
+        outputs["CodingAgent"] = ["```python models.py\nclass A: pass\n```\n```python\nprint", "(1)```"]
+        expected = wm.parse_code_blocks("".join(outputs["CodingAgent"])) * 2
+
+        sequential = await _run_coding(wm, monkeypatch, parallel=False)
+        parallel = await _run_coding(wm, monkeypatch, parallel=True)
+
+        assert [a["content"] for a in _coding_artifacts(sequential)] == [a["content"] for a in expected]
+        assert _coding_artifacts(sequential) == _coding_artifacts(parallel)
+        assert [u["artifact"] for u in sequential if u["type"] == "artifact"] == _coding_artifacts(sequential)
+
+
+class TestReviewLoop:
+    """Test the review and fix loop of the coding workflow"""
+
+    @pytest.mark.asyncio
+    async def test_diff_review_yields_no_corrected_artifacts(self, wm, outputs, monkeypatch):
+        """Code blocks in a re-review of a diff are fragments, not files"""
+        code = "".join(f"line_{n} = {n}\n" for n in range(30))
+        prompts: List[str] = []
+
+        async def review(prompt):
+            prompts.append(prompt)
+            yield "ISSUES:\n- Issue: fix line 3\nSTATUS: NEEDS_REVISION\n```python app.py\nline_3 = 4\n```"
+
+        outputs["PlanningAgent"] = ["1. App\n"]
+        outputs["CodingAgent"] = [f"```python app.py\n{code}```"]
+        outputs["ReviewAgent"] = review
+        outputs["FixCodeAgent"] = [f"```python app.py\n{code.replace('line_3 = 3', 'line_3 = 4')}```"]
+
+        updates = await _run_coding(wm, monkeypatch, parallel=False, max_iterations=2)
+
+        reviews = [u for u in updates if u["agent"] == "ReviewAgent" and u["type"] == "completed"]
+        assert prompts[0].startswith(wm._REVIEW_PREFIX)
+        assert prompts[1].startswith(wm._REVIEW_DIFF_PREFIX)
+        assert [a["filename"] for a in reviews[0]["corrected_artifacts"]] == ["app.py"]
+        assert reviews[1]["corrected_artifacts"] == []
+
+
+def _task_num(prompt: str) -> int:
+    return int(re.search(r"Current task \((\d+)/", prompt).group(1))
+
+
+class TestCodingTaskWaves:
+    """Test dependency-aware scheduling of checklist tasks"""
+
+    PLAN = "1. Model\n2. API (depends: 1)\n3. Docs (depends: none)\n4. Tests\n"
+
+    def test_groups_tasks_by_dependencies(self, wm):
+        """Noted dependencies form waves; unnoted tasks wait for all earlier ones"""
+        checklist = wm.parse_checklist(self.PLAN)
+
+        assert [item["task"] for item in checklist] == ["Model", "API", "Docs", "Tests"]
+        assert [item["depends_on"] for item in checklist] == [None, [1], [], None]
+        assert wm.plan_task_waves(checklist) == [[0, 2], [1], [3]]
+        assert wm.plan_task_waves(wm.parse_checklist("1. A\n2. B\n3. C")) == [[0], [1], [2]]
+
+    @pytest.mark.asyncio
+    async def test_waves_run_in_order_with_earlier_code(self, wm, outputs, monkeypatch):
+        """Tasks in a wave finish in any order; later waves see their code"""
+        prompts: Dict[int, str] = {}
+
+        async def coding(prompt):
+            task_num = _task_num(prompt)
+            prompts[task_num] = prompt
+            if task_num == 1:
+                await asyncio.sleep(0.05)
+            yield f"```python task{task_num}.py\nx = {task_num}\n```"
+
+        outputs["PlanningAgent"] = [self.PLAN]
+        outputs["CodingAgent"] = coding
+
+        updates = await _run_coding(wm, monkeypatch, parallel=True)
+
+        completed = [u["task_result"]["task_num"] for u in updates if u["type"] == "task_completed"]
+        assert completed == [3, 1, 2, 4]
+        assert "Existing code" not in prompts[1] and "Existing code" not in prompts[3]
+        assert "task1.py" in prompts[2] and "task3.py" in prompts[2]
+        assert "task2.py" in prompts[4]
+        assert [a["filename"] for a in _coding_artifacts(updates)] == [f"task{n}.py" for n in range(1, 5)]
+
+    @pytest.mark.asyncio
+    async def test_sequential_when_parallel_coding_disabled(self, wm, outputs, monkeypatch):
+        """With parallel coding off, every task sees all earlier code"""
+        prompts: Dict[int, str] = {}
+
+        async def coding(prompt):
+            prompts[_task_num(prompt)] = prompt
+            yield f"```python task{_task_num(prompt)}.py\nx = 1\n```"
+
+        outputs["PlanningAgent"] = [self.PLAN]
+        outputs["CodingAgent"] = coding
+
+        await _run_coding(wm, monkeypatch, parallel=False)
+
+        assert "task1.py" in prompts[3] and "task2.py" in prompts[3]
+
+    @pytest.mark.asyncio
+    async def test_failed_task_cancels_the_rest_of_its_wave(self, wm, outputs, monkeypatch):
+        """A failing task stops the other LLM calls of its wave"""
+        cancelled = []
+
+        async def coding(prompt):
+            if _task_num(prompt) == 1:
+                raise RuntimeError("LLM unavailable")
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.append(_task_num(prompt))
+                raise
+            yield ""
+
+        outputs["PlanningAgent"] = ["1. A (depends: none)\n2. B (depends: none)\n"]
+        outputs["CodingAgent"] = coding
+
+        with pytest.raises(RuntimeError, match="LLM unavailable"):
+            await asyncio.wait_for(_run_coding(wm, monkeypatch, parallel=True), timeout=5)
+        await asyncio.sleep(0)
+
+        assert cancelled == [2]
@@ -0,0 +1,144 @@
+"""Unit tests for Plan Executor
+
+Tests step-by-step plan execution without requiring LLM integration:
+- Circuit breaker for repeatedly failing action types
+- Bounded debug logs from plan_executor_node
+- Admission control for over-budget and concurrent plans
+"""
+
+import pytest
+from typing import Any, Dict, List
+
+from app.agent.langgraph.nodes import plan_executor as plan_executor_module
+from app.agent.langgraph.nodes.plan_executor import (
+    PlanExecutor,
+    estimate_plan_cost,
+    plan_executor_node,
+)
+from app.agent.langgraph.schemas.plan import ExecutionPlan, PlanStep, StepStatus
+from app.core.config import settings
+
+
+def _make_plan(actions: List[str]) -> ExecutionPlan:
+    """Create an approved plan with one step per action"""
+    steps = [
+        PlanStep(step=i + 1, action=action, target=f"file_{i}.py", description=f"Step {i + 1}")
+        for i, action in enumerate(actions)
+    ]
+    plan = ExecutionPlan.create(
+        session_id="test-session",
+        user_request="test",
+        steps=steps,
+        estimated_files=[],
+        risks=[],
+    )
+    plan.approve()
+    return plan
+
+
+async def _collect(executor: PlanExecutor, plan: ExecutionPlan) -> List[Dict[str, Any]]:
+    return [update async for update in executor.execute_plan(plan, {})]
+
+
+class TestCircuitBreaker:
+    """Test per-action circuit breaker"""
+
+    @pytest.mark.asyncio
+    async def test_opens_after_consecutive_failures(self):
+        """Remaining steps of a failing action are skipped once the circuit opens
+
+        Failures are counted per action regardless of case, as in dispatch.
+        """
+        executor = PlanExecutor()
+        calls = []
+
+        async def failing_step(step, state):
+            calls.append(step.step)
+            if step.action.lower() == "run_tests":
+                return {"success": False, "error": "boom", "continue_on_error": True}
+            return {"success": True, "output": "ok"}
+
+        executor._execute_step = failing_step
+        plan = _make_plan(["run_tests", "RUN_TESTS"] * 3 + ["create_file"])
+
+        updates = await _collect(executor, plan)
+
+        threshold = PlanExecutor.CIRCUIT_BREAKER_THRESHOLD
+        assert calls == list(range(1, threshold + 2)) + [7]
+        skipped = [u for u in updates if u["type"] == "step_skipped"]
+        assert len(skipped) == 6 - (threshold + 1)
+        assert all("Circuit open" in u["reason"] for u in skipped)
+        assert plan.steps[-1].status == StepStatus.COMPLETED.value
+
+    @pytest.mark.asyncio
+    async def test_success_resets_failure_count(self):
+        """Interleaved successes keep the circuit closed"""
+        executor = PlanExecutor()
+        results = iter([False, False, True, False, False, True])
+
+        async def flaky_step(step, state):
+            if next(results):
+                return {"success": True, "output": "ok"}
+            return {"success": False, "error": "flaky", "continue_on_error": True}
+
+        executor._execute_step = flaky_step
+        plan = _make_plan(["run_lint"] * 6)
+
+        updates = await _collect(executor, plan)
+
+        assert not any(u["type"] == "step_skipped" for u in updates)
+
+
+class TestPlanExecutorNode:
+    """Test plan_executor_node state updates"""
+
+    @pytest.mark.asyncio
+    async def test_debug_logs_are_bounded(self, monkeypatch):
+        """Only the most recent debug_log_cap events are returned"""
+        monkeypatch.setattr(settings, "debug_log_cap", 2)
+        plan = _make_plan(["create_file", "modify_file", "run_tests"])
+
+        result = await plan_executor_node({
+            "execution_plan": plan.to_dict(),
+            "enable_debug": True,
+        })
+
+        logs = result["debug_logs"]
+        assert len(logs) == 2
+        assert logs[-1]["event_type"] == "execution_complete"
+        assert logs[-1]["node"] == "plan_executor"
+        assert isinstance(logs[-1]["content"], str)
+        assert result["workflow_status"] == "completed"
+
+    def test_estimate_plan_cost(self):
+        """Cost is the sum of complexity weights"""
+        plan = _make_plan(["create_file", "modify_file", "run_tests"])
+        plan.steps[1].estimated_complexity = "medium"
+        plan.steps[2].estimated_complexity = "high"
+
+        assert estimate_plan_cost(plan) == 1 + 3 + 8
+
+    @pytest.mark.asyncio
+    async def test_rejects_over_budget_plan(self, monkeypatch):
+        """Plans above max_plan_budget are rejected without executing"""
+        monkeypatch.setattr(settings, "max_plan_budget", 2)
+        plan = _make_plan(["create_file", "modify_file", "run_tests"])
+
+        result = await plan_executor_node({"execution_plan": plan.to_dict()})
+
+        assert result["workflow_status"] == "rejected_over_budget"
+        assert "execution_plan" not in result
+
+    @pytest.mark.asyncio
+    async def test_rejects_concurrent_plan_for_same_workflow(self, monkeypatch):
+        """A second plan for a workflow that is already executing is rejected"""
+        monkeypatch.setattr(plan_executor_module, "_active_plans", {"wf-1"})
+        plan = _make_plan(["create_file"])
+
+        result = await plan_executor_node({
+            "execution_plan": plan.to_dict(),
+            "workflow_id": "wf-1",
+        })
+
+        assert result["workflow_status"] == "error"
+        assert "already executing" in result["last_error"]
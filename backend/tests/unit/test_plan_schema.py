@@ -0,0 +1,172 @@
+"""Unit tests for Plan Mode schemas
+
+Tests ExecutionPlan bookkeeping:
+- Progress summary
+- Dependency-aware next step selection
+- Dict round-trips, including incomplete input
+- Canonical step action and complexity values
+- Step completion and failure transitions
+"""
+
+from typing import List, Optional
+
+import pytest
+
+from app.agent.langgraph.schemas import plan as plan_module
+from app.agent.langgraph.schemas.plan import ExecutionPlan, PlanStep, StepStatus
+
+
+def _make_plan(statuses: List[str], dependencies: Optional[List[List[int]]] = None) -> ExecutionPlan:
+    """Create a plan with one step per status"""
+    dependencies = dependencies or [[] for _ in statuses]
+    steps = [
+        PlanStep(
+            step=i + 1,
+            action="create_file",
+            target=f"file_{i}.py",
+            description=f"Step {i + 1}",
+            dependencies=deps,
+            status=status,
+        )
+        for i, (status, deps) in enumerate(zip(statuses, dependencies))
+    ]
+    return ExecutionPlan.create(
+        session_id="test-session",
+        user_request="test",
+        steps=steps,
+        estimated_files=[],
+        risks=[],
+    )
+
+
+class TestPlanProgress:
+    """Test ExecutionPlan.get_progress"""
+
+    def test_counts_each_status(self):
+        """Each status is counted and the rest are pending"""
+        plan = _make_plan([
+            StepStatus.COMPLETED.value,
+            StepStatus.COMPLETED.value,
+            StepStatus.FAILED.value,
+            StepStatus.IN_PROGRESS.value,
+            StepStatus.PENDING.value,
+            StepStatus.SKIPPED.value,
+        ])
+
+        progress = plan.get_progress()
+
+        assert progress["total_steps"] == 6
+        assert progress["completed"] == 2
+        assert progress["failed"] == 1
+        assert progress["in_progress"] == 1
+        assert progress["pending"] == 2
+        assert progress["progress_percent"] == 2 / 6 * 100
+
+    def test_empty_plan(self):
+        """An empty plan reports zero progress"""
+        progress = _make_plan([]).get_progress()
+
+        assert progress["total_steps"] == 0
+        assert progress["progress_percent"] == 0
+
+
+class TestNextStep:
+    """Test ExecutionPlan.get_next_step"""
+
+    def test_skips_steps_with_unmet_dependencies(self):
+        """The first pending step whose dependencies completed is returned"""
+        plan = _make_plan(
+            [StepStatus.COMPLETED.value, StepStatus.FAILED.value, StepStatus.PENDING.value, StepStatus.PENDING.value],
+            dependencies=[[], [], [1, 2], [1]],
+        )
+
+        assert plan.get_next_step().step == 4
+
+    def test_step_without_dependencies(self):
+        """Pending steps without dependencies are always eligible"""
+        plan = _make_plan([StepStatus.PENDING.value, StepStatus.PENDING.value], dependencies=[[2], []])
+
+        assert plan.get_next_step().step == 2
+
+    def test_no_eligible_step(self):
+        """None is returned when no pending step can run"""
+        plan = _make_plan([StepStatus.FAILED.value, StepStatus.PENDING.value], dependencies=[[], [1]])
+
+        assert plan.get_next_step() is None
+
+
+class TestPlanSerialization:
+    """Test ExecutionPlan.to_dict/from_dict"""
+
+    def test_round_trip(self):
+        """A serialized plan loads back unchanged"""
+        plan = _make_plan([StepStatus.COMPLETED.value, StepStatus.PENDING.value], dependencies=[[], [1]])
+        plan.approve()
+
+        assert ExecutionPlan.from_dict(plan.to_dict()) == plan
+
+    def test_incomplete_input_uses_defaults(self, monkeypatch):
+        """Missing or loosely typed fields load the same with or without msgspec"""
+        data = {"plan_id": "plan-1", "steps": [{"step": 1, "action": None}, {"step": 2.0}]}
+
+        loaded = ExecutionPlan.from_dict(data)
+        monkeypatch.setattr(plan_module, "MSGSPEC_AVAILABLE", False)
+
+        assert loaded == ExecutionPlan.from_dict(data)
+        assert loaded.total_steps == 2
+        assert loaded.steps[0].status == "pending"
+        assert loaded.steps[0].action is None
+
+
+class TestStepNormalization:
+    """Test canonical PlanStep action and complexity values"""
+
+    @pytest.mark.parametrize("msgspec_available", [True, False])
+    def test_known_values_are_canonical(self, monkeypatch, msgspec_available):
+        """Known labels are normalized and shared by every step"""
+        monkeypatch.setattr(plan_module, "MSGSPEC_AVAILABLE", msgspec_available)
+        data = {"step": 1, "target": "a.py", "description": "d"}
+
+        first = PlanStep.from_dict({**data, "action": " Create_File", "estimated_complexity": "HIGH"})
+        second = PlanStep.from_dict({**data, "action": "".join(["create", "_file"]), "estimated_complexity": "hi" + "gh"})
+
+        assert (first.action, first.estimated_complexity) == ("create_file", "high")
+        assert first.action is second.action
+        assert first.estimated_complexity is second.estimated_complexity
+
+    def test_unknown_values_are_kept(self):
+        """Custom actions and free-form complexity labels pass through"""
+        step = PlanStep(step=1, action="deploy", target="", description="", estimated_complexity="trivial")
+
+        assert (step.action, step.estimated_complexity) == ("deploy", "trivial")
+
+
+class TestStepTransitions:
+    """Test ExecutionPlan.complete_step/fail_step"""
+
+    def test_complete_step_advances_to_next(self):
+        """Completing a step starts the next one"""
+        plan = _make_plan([StepStatus.IN_PROGRESS.value, StepStatus.PENDING.value])
+
+        plan.complete_step(1, output="done")
+
+        assert plan.steps[0].status == StepStatus.COMPLETED.value
+        assert plan.steps[0].output == "done"
+        assert plan.steps[1].status == StepStatus.IN_PROGRESS.value
+        assert plan.current_step == 2
+
+        plan.complete_step(2)
+        assert plan.execution_completed_at is not None
+
+    def test_lookup_follows_modified_steps(self):
+        """Steps replaced via modify() are found by number"""
+        plan = _make_plan([StepStatus.PENDING.value])
+        plan.fail_step(1, "boom")
+        new_steps = _make_plan([StepStatus.PENDING.value, StepStatus.PENDING.value]).steps
+
+        plan.modify(new_steps, "retry")
+        plan.fail_step(2, "again")
+
+        assert new_steps[1].status == StepStatus.FAILED.value
+        assert new_steps[1].error == "again"
+        assert new_steps[0].status == StepStatus.PENDING.value
@@ -0,0 +1,117 @@
+"""Unit tests for specialized agents
+
+Runs the agents' tool workflows against a stubbed use_tool:
+- Concurrent ResearchAgent tool calls
+- Overlapped source read in TestingAgent
+"""
+
+import asyncio
+from types import SimpleNamespace
+from typing import Any, Dict, List, Tuple
+
+import pytest
+
+from app.agent.specialized.research_agent import ResearchAgent
+from app.agent.specialized import testing_agent
+
+
+def _stub_tools(agent, outputs: Dict[str, Any], delays: Dict[str, float] = None) -> List[Tuple[str, Dict]]:
+    """Replace agent.use_tool, returning (tool, params) calls in the order they finish
+
+    A value in outputs that is an exception is raised by its tool instead.
+    """
+    finished: List[Tuple[str, Dict]] = []
+    delays = delays or {}
+
+    async def use_tool(tool_name: str, params: Dict) -> Any:
+        await asyncio.sleep(delays.get(tool_name, 0))
+        finished.append((tool_name, params))
+        output = outputs[tool_name]
+        if isinstance(output, BaseException):
+            raise output
+        return SimpleNamespace(success=True, output=output, error=None)
+
+    agent.use_tool = use_tool
+    return finished
+
+
+class TestResearchAgent:
+    """Test ResearchAgent.process"""
+
+    @pytest.mark.asyncio
+    async def test_findings_keep_call_order(self):
+        """Calls finish in any order; findings follow the call order"""
+        agent = ResearchAgent("test-session")
+        finished = _stub_tools(
+            agent,
+            {"search_files": ["a.py"], "list_directory": ["a.py", "b.py"], "read_file": "x = 1", "git_status": "clean"},
+            delays={"search_files": 0.03, "list_directory": 0.02, "read_file": 0.01},
+        )
+
+        results = await agent.process("research", {"search_pattern": "*.py", "directory": ".", "file_path": "a.py"})
+
+        assert [tool for tool, _ in finished] == ["git_status", "read_file", "list_directory", "search_files"]
+        assert results["findings"] == [
+            "Found 1 files matching pattern",
+            "Listed 2 items in directory",
+            "Read file: a.py",
+        ]
+        assert results["context"] == {
+            "directory_contents": ["a.py", "b.py"],
+            "file_content": "x = 1",
+            "git_status": "clean",
+        }
+
+    @pytest.mark.asyncio
+    async def test_tool_error_is_raised(self):
+        """A failing tool call still surfaces"""
+        agent = ResearchAgent("test-session")
+        _stub_tools(agent, {"read_file": PermissionError("denied"), "git_status": "clean"})
+
+        with pytest.raises(PermissionError, match="denied"):
+            await agent.process("research", {"file_path": "a.py"})
+
+
+class TestTestingAgent:
+    """Test TestingAgent.process"""
+
+    CONTEXT = {
+        "source_file": "app.py",
+        "test_path": "tests",
+        "test_code": "def test_x(): pass",
+        "test_file_path": "tests/test_app.py",
+    }
+
+    @pytest.mark.asyncio
+    async def test_new_test_results_replace_earlier_ones(self):
+        """The new test file is written and run after the existing tests"""
+        agent = testing_agent.TestingAgent("test-session")
+        finished = _stub_tools(
+            agent,
+            {"read_file": "x = 1", "run_tests": {"passed": True}, "write_file": "ok"},
+            delays={"read_file": 0.02},
+        )
+
+        results = await agent.process("test", dict(self.CONTEXT))
+
+        assert [tool for tool, _ in finished] == ["run_tests", "read_file", "write_file", "run_tests"]
+        assert [params["test_path"] for tool, params in finished if tool == "run_tests"] == ["tests", "tests/test_app.py"]
+        assert results["source_code"] == "x = 1"
+        assert results["test_file"] == "tests/test_app.py"
+        assert results["passed"] is True
+
+    @pytest.mark.asyncio
+    async def test_failed_read_stops_later_steps(self):
+        """A failing source read cancels the test run and writes nothing"""
+        agent = testing_agent.TestingAgent("test-session")
+        finished = _stub_tools(
+            agent,
+            {"read_file": PermissionError("denied"), "run_tests": {"passed": True}, "write_file": "ok"},
+            delays={"run_tests": 0.05},
+        )
+
+        with pytest.raises(PermissionError, match="denied"):
+            await agent.process("test", dict(self.CONTEXT))
+        await asyncio.sleep(0.1)
+
+        assert [tool for tool, _ in finished] == ["read_file"]
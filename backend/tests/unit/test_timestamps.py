@@ -0,0 +1,34 @@
+"""Unit tests for cached event timestamps"""
+
+from datetime import datetime, timedelta
+
+from app.utils import timestamps as timestamps_module
+from app.utils.timestamps import CachedTimestamp
+
+
+class TestCachedTimestamp:
+    """Test suite for CachedTimestamp"""
+
+    def test_timestamp_reused_within_resolution(self, monkeypatch):
+        """The formatted time only advances once the resolution window passes"""
+        clock = [100.0]
+        now = [datetime(2024, 1, 1, 12, 0, 0)]
+
+        class FakeDatetime:
+            @staticmethod
+            def utcnow():
+                return now[0]
+
+        monkeypatch.setattr(timestamps_module.time, "monotonic", lambda: clock[0])
+        monkeypatch.setattr(timestamps_module, "datetime", FakeDatetime)
+        timestamp = CachedTimestamp(resolution=0.5)
+
+        assert timestamp.now_iso() == "2024-01-01T12:00:00"
+
+        clock[0] += 0.25
+        now[0] += timedelta(seconds=0.25)
+        assert timestamp.now_iso() == "2024-01-01T12:00:00"
+
+        clock[0] += 0.25
+        now[0] += timedelta(seconds=0.25)
+        assert timestamp.now_iso() == "2024-01-01T12:00:00.500000"
@@ -0,0 +1,147 @@
+"""Unit tests for UnifiedLangGraphWorkflow
+
+Tests workflow setup without requiring LLM integration:
+- Compiled graph reuse across requests of the same shape
+- Graph-derived recursion limit
+- Streaming of node updates and tokens
+"""
+
+import tempfile
+from types import SimpleNamespace
+
+import pytest
+from langgraph.checkpoint.memory import MemorySaver
+from langgraph.config import get_stream_writer
+from langgraph.graph import StateGraph, START, END
+
+from app.agent.langgraph.schemas.state import QualityGateState
+from app.agent.langgraph import unified_workflow as unified_workflow_module
+from app.agent.langgraph.unified_workflow import UnifiedLangGraphWorkflow
+
+ANALYSIS = {
+    "complexity": "simple",
+    "task_type": "implementation",
+    "workflow_strategy": "linear",
+    "required_agents": ["coder"],
+    "max_iterations": 1,
+}
+
+
+class TestGraphCache:
+    """Test compiled graph caching"""
+
+    def test_same_shape_reuses_graph(self, monkeypatch):
+        """Analyses with the same strategy, agents and approval share one graph"""
+        built = []
+
+        def fake_create(analysis):
+            built.append(analysis)
+            return object()
+
+        monkeypatch.setattr(unified_workflow_module, "create_workflow_from_supervisor_analysis", fake_create)
+        workflow = UnifiedLangGraphWorkflow()
+        analysis = {"workflow_strategy": "linear", "required_agents": ["coder", "reviewer"]}
+
+        first = workflow._get_workflow_graph(analysis)
+        second = workflow._get_workflow_graph({**analysis, "complexity": "simple"})
+        third = workflow._get_workflow_graph({**analysis, "requires_human_approval": True})
+
+        assert first is second
+        assert third is not first
+        assert len(built) == 2
+        assert workflow.compiled_graphs == 2
+
+    def test_cache_is_bounded(self, monkeypatch):
+        """The least recently used graph is evicted past GRAPH_CACHE_SIZE"""
+        monkeypatch.setattr(unified_workflow_module, "create_workflow_from_supervisor_analysis", lambda a: object())
+        monkeypatch.setattr(UnifiedLangGraphWorkflow, "GRAPH_CACHE_SIZE", 2)
+        workflow = UnifiedLangGraphWorkflow()
+
+        for agent in ("a", "b", "a", "c"):
+            workflow._get_workflow_graph({"required_agents": [agent]})
+
+        assert [key[1] for key in workflow._graph_cache] == [("a",), ("c",)]
+
+
+class TestRecursionLimit:
+    """Test the graph-derived recursion limit"""
+
+    def test_scales_with_nodes_and_iterations(self):
+        """The limit covers every node once per iteration, within bounds"""
+        workflow = UnifiedLangGraphWorkflow()
+        graph = SimpleNamespace(nodes={"__start__": None, "coder": None, "reviewer": None})
+
+        assert workflow._recursion_limit(graph, 3) == (3 + 1) * (3 + 1)
+        assert workflow._recursion_limit(graph, 0) == UnifiedLangGraphWorkflow.MIN_RECURSION_LIMIT
+        assert workflow._recursion_limit(graph, 1000) == UnifiedLangGraphWorkflow.MAX_RECURSION_LIMIT
+
+
+async def _execute_with_coder(monkeypatch, coder):
+    """Run execute on a one-node graph whose only node is coder, collecting its updates"""
+
+    def build_graph(analysis):
+        graph = StateGraph(QualityGateState)
+        graph.add_node("coder", coder)
+        graph.add_edge(START, "coder")
+        graph.add_edge("coder", END)
+        return graph.compile(checkpointer=MemorySaver())
+
+    async def analyze(user_request):
+        yield {"type": "analysis", "content": ANALYSIS}
+
+    monkeypatch.setattr(unified_workflow_module, "create_workflow_from_supervisor_analysis", build_graph)
+    workflow = UnifiedLangGraphWorkflow()
+    monkeypatch.setattr(workflow.supervisor, "analyze_request_async", analyze)
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        return [update async for update in workflow.execute("Write main", tmpdir)]
+
+
+class TestExecute:
+    """Test execute streaming"""
+
+    @pytest.mark.asyncio
+    async def test_streams_node_tokens_before_node_update(self, monkeypatch):
+        """Tokens written by a node are yielded as they arrive, then its update"""
+
+        def coder(state):
+            writer = get_stream_writer()
+            for token in ("def ", "main"):
+                writer({"node": "coder", "type": "token", "content": token})
+            return {"current_node": "coder"}
+
+        updates = await _execute_with_coder(monkeypatch, coder)
+
+        statuses = [(u["node"], u["status"]) for u in updates]
+        assert statuses[:2] == [("supervisor", "running"), ("workflow_builder", "running")]
+        assert statuses[2:] == [
+            ("coder", "streaming"),
+            ("coder", "streaming"),
+            ("coder", "running"),
+            ("END", "completed"),
+        ]
+        assert [u["updates"]["content"] for u in updates[2:4]] == ["def ", "main"]
+
+    @pytest.mark.asyncio
+    async def test_streams_bare_token_payloads(self, monkeypatch):
+        """A node writing plain strings streams them instead of failing the run"""
+
+        def coder(state):
+            writer = get_stream_writer()
+            for token in ("def ", "main"):
+                writer(token)
+            return {"current_node": "coder"}
+
+        updates = await _execute_with_coder(monkeypatch, coder)
+
+        statuses = [(u["node"], u["status"]) for u in updates[2:]]
+        assert statuses == [
+            ("stream", "streaming"),
+            ("stream", "streaming"),
+            ("coder", "running"),
+            ("END", "completed"),
+        ]
+        assert [u["updates"] for u in updates[2:4]] == [
+            {"type": "token", "content": "def "},
+            {"type": "token", "content": "main"},
+        ]